@@ -1,14 +1,23 @@
-from fastapi import Request, UploadFile, HTTPException
-from fastapi.responses import Response
+import asyncio
+
+from fastapi import HTTPException, Request, UploadFile
 from typing import Dict, Any, Optional
-import base64
 
-from services.openai.image_classifier import ImageClassifier
-from services.thumbnail_generator import ThumbnailGenerator
-from services.openai.cost_generator import CostGenerator
-from dal.image_dal import ImageDAL
 from models.image_record import ImageRecord
-from utils.media_validation import ensure_base64_image, read_audio_bytes
+from services.thumbnail_worker import ThumbnailPool
+from utils.media_validation import UNSUPPORTED_IMAGE_DETAIL, decode_image_upload, read_audio_bytes
+
+
+async def _build_thumbnail(thumb_pool: ThumbnailPool, image_bytes: bytes) -> bytes:
+    """Return the encoded thumbnail, reporting undecodable images as a 400.
+
+    Raises:
+        HTTPException(400) if Pillow cannot decode the image.
+    """
+    try:
+        return await thumb_pool.run(image_bytes)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=UNSUPPORTED_IMAGE_DETAIL) from exc
 
 
 async def upload_image(
@@ -29,9 +38,10 @@ async def upload_image(
         A dict containing: id, label, reasoning, image_description, input_tokens, output_tokens, latency, cost
     """
 
-    # Read file bytes. Expect the client to send base64-encoded image data as file body.
+    # Read file bytes. The body may be the binary image or base64 text; both
+    # the classifier and the thumbnail work from the binary form.
     raw = await file.read()
-    b64_input = ensure_base64_image(raw)
+    image_bytes = decode_image_upload(raw)
 
     audio_bytes: Optional[bytes] = None
     if audio_file:
@@ -39,20 +49,29 @@ async def upload_image(
 
     cleaned_text = text_input.strip() if text_input else None
 
-    # Acquire shared resources from app.state
-    openai_client = request.app.state.openai_client
-    db_initializer = request.app.state.db_initializer
-
-    # Services
-    classifier = ImageClassifier(openai_client)
-    thumb_gen = ThumbnailGenerator()
-    cost_gen = CostGenerator()
-    image_dal = ImageDAL(db_initializer)
-
-    # Classify image
-    classification = await classifier.classify_media(
-        b64_input, text_input=cleaned_text, audio_bytes=audio_bytes
-    )
+    # Shared services are built once at startup (see utils.app_services)
+    state = request.app.state
+    classifier = state.classifier
+    thumb_pool = state.thumb_pool
+    cost_gen = state.cost_gen
+    image_dal = state.image_dal
+
+    # Classify image while the thumbnail is built: the OpenAI round trip
+    # dominates wall time, so the thumbnail CPU work hides behind it.
+    # The thumbnail is built in a worker process, so neither the event loop nor
+    # other requests contend with it for the GIL. The TaskGroup cancels the
+    # other call as soon as one fails, so no paid request runs on unobserved.
+    try:
+        async with asyncio.TaskGroup() as group:
+            classify_task = group.create_task(
+                classifier.classify_media(image_bytes, text_input=cleaned_text, audio_bytes=audio_bytes)
+            )
+            thumb_task = group.create_task(_build_thumbnail(thumb_pool, image_bytes))
+    except ExceptionGroup as errors:
+        # Surface the first failure itself, so HTTPExceptions and the
+        # exception type reported by wrap_http_errors are unchanged.
+        raise errors.exceptions[0] from None
+    classification, thumbnail = classify_task.result(), thumb_task.result()
 
     label = classification.get("label")
     reasoning = classification.get("reasoning")
@@ -64,22 +83,14 @@ async def upload_image(
     output_tokens = int(output_tokens_raw) if output_tokens_raw is not None else 0
     latency = classification.get("latency") or 0.0
 
-    # Create thumbnail (returns base64 PNG string)
-    thumbnail_b64 = thumb_gen.create_thumbnail_from_base64(b64_input)
-
     # Persist record
-    user_doc_parts = []
-    if cleaned_text:
-        user_doc_parts.append(cleaned_text)
-    if audio_transcript:
-        user_doc_parts.append(audio_transcript)
-    user_documentation = "\n".join(user_doc_parts) if user_doc_parts else None
+    user_documentation = "\n".join(filter(None, (cleaned_text, audio_transcript))) or None
 
     record = ImageRecord(
         id=None,
         image_filename=file.filename or "uploaded_image",
         image_description=image_description,
-        image_thumbnail=base64.b64decode(thumbnail_b64),
+        image_thumbnail=thumbnail,
         label=label,
         reasoning=reasoning,
         user_documentation=user_documentation,
@@ -111,30 +122,3 @@ async def upload_image(
         "cost": cost,
     }
 
-
-async def get_thumbnail(request: Request, image_id: int) -> Response:
-    """Controller to fetch the thumbnail bytes for a stored image.
-
-    Args:
-        request: FastAPI Request (to access app.state.db_initializer).
-        image_id: Integer id of the image row.
-
-    Returns:
-        FastAPI `Response` with `content` set to raw PNG bytes and
-        `media_type` set to `image/png`.
-
-    Raises:
-        HTTPException(404) if the image or thumbnail is not found.
-    """
-    db_initializer = request.app.state.db_initializer
-    image_dal = ImageDAL(db_initializer)
-
-    record = await image_dal.get_image_by_id(int(image_id))
-    if record is None:
-        raise HTTPException(status_code=404, detail="Image not found")
-
-    if not record.image_thumbnail:
-        raise HTTPException(status_code=404, detail="Thumbnail not available for this image")
-
-    # Stored thumbnails are raw PNG bytes; return them directly
-    return Response(content=record.image_thumbnail, media_type="image/png")
@@ -1,8 +1,9 @@
+import asyncio
+import logging
+
 from fastapi import Request, HTTPException
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any
 
-from services.openai.annotation_gen import OperativeNoteGenerator
-from dal.image_dal import ImageDAL
 from models.image_record import ImageRecord
 
 
@@ -25,21 +26,67 @@ async def generate_opnote(request: Request, base_opnote: str, image_ids: List[in
     Raises:
         HTTPException(404) if any image id is not found.
     """
-    db_initializer = request.app.state.db_initializer
-    openai_client = request.app.state.openai_client
-
-    image_dal = ImageDAL(db_initializer)
-
-    images: List[ImageRecord] = []
-    for iid in image_ids:
-        rec = await image_dal.get_image_by_id(int(iid))
-        if rec is None:
-            raise HTTPException(status_code=404, detail=f"Image id {iid} not found")
-        images.append(rec)
+    generator = request.app.state.opnote_generator
+    images = await _load_images(request, image_ids)
 
-    generator = OperativeNoteGenerator(openai_client)
     opnote_md = await generator.generate_opnote(
         images=images, base_opnote=base_opnote, template=base_opnote
     )
 
     return {"operative_note": opnote_md}
+
+
+async def stream_opnote(request: Request, base_opnote: str, image_ids: List[int]) -> AsyncIterator[str]:
+    """Resolve the images, then return an iterator of Server-Sent Event frames.
+
+    The images are loaded before returning so a missing id still surfaces as a
+    404 rather than as an error inside an already-started stream. Each text
+    delta becomes one `data:` event; the stream ends with an `event: done`
+    frame, or `event: error` if generation fails midway. Like the JSON routes
+    (see `routes.error_handling`), the error frame carries only the exception
+    type name; details are logged server-side.
+
+    Raises:
+        HTTPException(404) if any image id is not found.
+    """
+    generator = request.app.state.opnote_generator
+    images = await _load_images(request, image_ids)
+
+    async def events() -> AsyncIterator[str]:
+        deltas = generator.stream_opnote(images=images, base_opnote=base_opnote, template=base_opnote)
+        try:
+            async for delta in deltas:
+                # Stop pulling from OpenAI as soon as the client goes away so
+                # no further output tokens are generated (and billed).
+                if await request.is_disconnected():
+                    break
+                yield _sse_data(delta)
+            else:
+                yield "event: done\ndata: \n\n"
+        except Exception as exc:
+            logging.exception("Operative note stream failed")
+            yield "event: error\n" + _sse_data(type(exc).__name__)
+        finally:
+            await deltas.aclose()
+
+    return events()
+
+
+def _sse_data(text: str) -> str:
+    """Encode `text` as one SSE event, one `data:` line per text line."""
+    return "".join(f"data: {line}\n" for line in text.split("\n")) + "\n"
+
+
+async def _load_images(request: Request, image_ids: List[int]) -> List[ImageRecord]:
+    """Fetch the records for `image_ids` in order, raising 404 for any missing id."""
+    image_loader = request.app.state.image_loader
+
+    # The shared loader coalesces these (and other requests' lookups) into
+    # batched IN (...) queries.
+    records = await asyncio.gather(*(image_loader.load(int(iid)) for iid in image_ids))
+    images: List[ImageRecord] = []
+    for iid, rec in zip(image_ids, records):
+        if rec is None:
+            raise HTTPException(status_code=404, detail=f"Image id {iid} not found")
+        images.append(rec)
+    return images
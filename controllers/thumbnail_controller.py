@@ -0,0 +1,95 @@
+"""Controller for serving stored image thumbnails with HTTP caching."""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+from fastapi import Request, HTTPException
+from fastapi.responses import FileResponse, Response
+
+from utils.thumbnail_store import MEDIA_TYPES
+
+# Thumbnails never change after insert, but they are clinical images, so
+# only the requesting browser (not shared proxies) may cache them.
+CACHE_CONTROL = "private, max-age=3600"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Return True if an `If-None-Match` header value matches `etag`."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+async def get_thumbnail(request: Request, image_id: int) -> Response:
+    """Controller to fetch the thumbnail bytes for a stored image.
+
+    Thumbnails stored as files are sent with `FileResponse`, straight from the
+    OS page cache. Metadata is read first to build a weak ETag; when it
+    matches the client's `If-None-Match`, a 304 is returned without touching
+    the thumbnail bytes. Only legacy blob thumbnails consult the in-process
+    `app.state.thumbnail_cache`, falling back to IMAGE_THUMBNAIL.
+
+    Args:
+        request: FastAPI Request (to access app.state services and headers).
+        image_id: Integer id of the image row.
+
+    Returns:
+        FastAPI `Response` with the thumbnail (JPEG, or PNG for legacy rows),
+        or an empty 304 response when the client's cached copy is current.
+
+    Raises:
+        HTTPException(404) if the image or thumbnail is not found.
+    """
+    state = request.app.state
+    if_none_match = request.headers.get("if-none-match")
+
+    meta = await state.thumbnail_dal.get_thumbnail_meta(int(image_id))
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    path, length, created_at = meta
+    if path:
+        return _file_response(state.thumbnail_store.path_for(path), f'W/"{path}"', if_none_match)
+    if not length:
+        raise HTTPException(status_code=404, detail="Thumbnail not available for this image")
+
+    etag = f'W/"{image_id}-{created_at}-{length}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    # Only legacy blobs are cached in-process; file-backed rows returned above.
+    cached = state.thumbnail_cache.get(int(image_id))
+    if cached is not None and cached[0] == etag:
+        thumbnail = cached[1]
+    else:
+        thumbnail = await state.thumbnail_dal.get_thumbnail_blob(int(image_id))
+        if not thumbnail:
+            raise HTTPException(status_code=404, detail="Thumbnail not available for this image")
+        state.thumbnail_cache.put(int(image_id), etag, thumbnail)
+
+    # Stored thumbnails are raw PNG bytes. Starlette sends a bytes body in a
+    # single ASGI message without copying it, so no memoryview/stream wrapper
+    # is needed here.
+    return Response(content=thumbnail, media_type="image/png", headers=headers)
+
+
+def _file_response(path: Path, etag: str, if_none_match: Optional[str]) -> Response:
+    """Serve a thumbnail file, or a 304 when the client's copy (by `etag`) is current.
+
+    Thumbnail file names are SHA-256 hashes of the file contents (and may be
+    shared by several images), so equal names mean identical bytes: the name
+    alone is a valid validator and no stat is needed to answer a revalidation.
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Thumbnail not available for this image")
+    # Passing the stat result avoids a second stat inside FileResponse.
+    media_type = MEDIA_TYPES.get(path.suffix, "application/octet-stream")
+    return FileResponse(path, media_type=media_type, headers=headers, stat_result=stat_result)
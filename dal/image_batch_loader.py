@@ -0,0 +1,106 @@
+"""Coalesce concurrent single-image lookups into batched IN queries.
+
+Callers `await loader.load(image_id)` as if issuing one query; lookups that
+arrive within `max_delay_ms` of each other (up to `max_batch_size` ids) are
+answered by a single `ImageDAL.get_images_by_ids` call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import List, Optional, Set, Tuple
+
+from dal.image_dal import ImageDAL
+from models.image_record import ImageRecord
+
+_Pending = Tuple[int, "asyncio.Future[Optional[ImageRecord]]"]
+
+
+class ImageBatchLoader:
+    """Shared coalescer for `IMAGE` lookups by id.
+
+    Args:
+        image_dal: DAL used to run the batched `WHERE id IN (...)` query.
+        max_batch_size: Maximum number of ids resolved by one query.
+        max_delay_ms: How long the first pending lookup waits for others to join.
+    """
+
+    def __init__(
+        self, image_dal: ImageDAL, max_batch_size: int = 32, max_delay_ms: float = 2.0
+    ) -> None:
+        self._dal = image_dal
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000.0
+        self._queue: asyncio.Queue[_Pending] = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+    async def load(self, image_id: int) -> Optional[ImageRecord]:
+        """Return the `ImageRecord` for `image_id`, or None if it does not exist."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        future: asyncio.Future[Optional[ImageRecord]] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((int(image_id), future))
+        return await future
+
+    async def close(self) -> None:
+        """Stop the background drain task and wait for in-flight batches.
+
+        Lookups that were still queued fail with `RuntimeError` instead of
+        leaving their callers waiting forever.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        queued = []
+        while not self._queue.empty():
+            queued.append(self._queue.get_nowait())
+        _fail_closed(queued)
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def _run(self) -> None:
+        """Drain the queue into batches bounded by size and delay."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[_Pending] = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            try:
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Closed while a batch was forming: its ids left the queue already.
+                _fail_closed(batch)
+                raise
+            # Dispatch without blocking the next batch from forming.
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[_Pending]) -> None:
+        """Resolve every future in `batch` from one `get_images_by_ids` call."""
+        try:
+            records = await self._dal.get_images_by_ids([image_id for image_id, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        by_id = {rec.id: rec for rec in records}
+        for image_id, future in batch:
+            if not future.done():
+                future.set_result(by_id.get(image_id))
+
+
+def _fail_closed(pending: List[_Pending]) -> None:
+    """Fail every unresolved future in `pending` because the loader closed."""
+    for _, future in pending:
+        if not future.done():
+            future.set_exception(RuntimeError("ImageBatchLoader closed"))
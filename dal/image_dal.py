@@ -6,37 +6,44 @@ Provides ImageDAL class with async CRUD operations compatible with
 
 from __future__ import annotations
 
+import asyncio
 import time
-from typing import List, Optional, Sequence
-
-import aiosqlite
+from typing import List, Optional, Sequence, Union
 
+from dal import image_sql as sql
+from dal.thumbnail_files import unlink_unreferenced
 from models.image_record import ImageRecord
-from utils.database_init import AsyncDatabaseInitializer
+from utils.connection_provider import ConnectionProvider
+from utils.thumbnail_cache import ThumbnailCache
+from utils.thumbnail_store import ThumbnailStore
+
+
+# `image_sql.COLUMNS` mirrors the field order of `ImageRecord`, so rows are
+# mapped positionally with `ImageRecord(*row)`.
 
 
 class ImageDAL:
     """Data access layer for IMAGE records.
 
-    The constructor accepts an `AsyncDatabaseInitializer` (or any object
-    exposing an async `connection()` context manager that yields an
-    `aiosqlite.Connection`).
+    The constructor accepts an `AsyncDatabaseInitializer` or any other
+    `ConnectionProvider`: reads use its read-only `connection()` and
+    `create_image`/`update_image`/`delete_image` use its `transaction()`.
+    When a `thumbnail_cache` is given, updated and deleted images are evicted
+    from it. Thumbnail bytes passed to
+    `create_image`/`update_image` are written to `thumbnail_store` as
+    content-addressed files and only their name is kept in
+    `IMAGE.thumbnail_path`; a file is removed once no row references it.
     """
 
-    _COLUMNS = (
-        "id",
-        "image_filename",
-        "image_description",
-        "image_thumbnail",
-        "label",
-        "reasoning",
-        "user_documentation",
-        "created_at",
-    )
-    _COLUMN_LIST, _INSERT_COLUMNS = ", ".join(_COLUMNS), ", ".join(_COLUMNS[1:])
-
-    def __init__(self, db_initializer: AsyncDatabaseInitializer) -> None:
+    def __init__(
+        self,
+        db_initializer: ConnectionProvider,
+        thumbnail_cache: Optional[ThumbnailCache] = None,
+        thumbnail_store: Optional[ThumbnailStore] = None,
+    ) -> None:
         self._db = db_initializer
+        self._thumbnail_cache = thumbnail_cache
+        self._store = thumbnail_store
 
     async def create_image(self, record: ImageRecord) -> int:
         """Insert a new IMAGE row and return the new id.
@@ -48,32 +55,46 @@ class ImageDAL:
             The integer primary key of the created row.
         """
         created_at = record.created_at or int(time.time())
+        data = record.image_thumbnail
+        name = self._name_for(data) if data is not None else record.thumbnail_path
 
-        async with self._db.connection() as conn:
+        async with self._db.transaction() as conn:
             cur = await conn.execute(
-                f"INSERT INTO IMAGE ({self._INSERT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (
-                    record.image_filename,
-                    record.image_description,
-                    record.image_thumbnail,
-                    record.label,
-                    record.reasoning,
-                    record.user_documentation,
-                    created_at,
-                ),
+                sql.SQL_INSERT,
+                (record.image_filename, record.image_description, record.label, record.reasoning,
+                 record.user_documentation, created_at, name),
             )
-            await conn.commit()
-            return cur.lastrowid
+            image_id = (await cur.fetchone())[0]
+            if data is not None:
+                # Written inside the transaction (skipped if the file already
+                # exists), so a concurrent delete cannot unlink it unseen.
+                await asyncio.to_thread(self._store.write, name, data)
+        return image_id
 
     async def get_image_by_id(self, image_id: int) -> Optional[ImageRecord]:
         """Return ImageRecord for `image_id`, or None if not found."""
         async with self._db.connection() as conn:
-            cur = await conn.execute(
-                f"SELECT {self._COLUMN_LIST} FROM IMAGE WHERE id = ?",
-                (image_id,),
-            )
-            row = await cur.fetchone()
-            return self._row_to_record(row) if row else None
+            row = await (await conn.execute(sql.SQL_SELECT_BY_ID, (image_id,))).fetchone()
+        return ImageRecord(*row) if row else None
+
+    async def get_images_by_ids(self, image_ids: Sequence[int]) -> List[ImageRecord]:
+        """Fetch several IMAGE rows with a single `IN (...)` query.
+
+        Args:
+            image_ids: Ids to load; duplicates are allowed.
+
+        Returns:
+            Records in the order of `image_ids`. Ids with no matching row are
+            skipped, so callers can detect missing ids by comparing lengths/ids.
+        """
+        unique_ids = list(dict.fromkeys(map(int, image_ids)))
+        if not unique_ids:
+            return []
+        query = sql.SQL_SELECT_IN.format(", ".join("?" * len(unique_ids)))
+        async with self._db.connection() as conn:
+            rows = await (await conn.execute(query, unique_ids)).fetchall()
+        by_id = {row[0]: ImageRecord(*row) for row in rows}
+        return [by_id[i] for i in map(int, image_ids) if i in by_id]
 
     async def list_images(self, limit: int = 100, offset: int = 0) -> List[ImageRecord]:
         """List IMAGE rows with optional paging.
@@ -83,12 +104,8 @@ class ImageDAL:
             offset: Rows to skip.
         """
         async with self._db.connection() as conn:
-            cur = await conn.execute(
-                f"SELECT {self._COLUMN_LIST} FROM IMAGE ORDER BY id DESC LIMIT ? OFFSET ?",
-                (limit, offset),
-            )
-            rows = await cur.fetchall()
-            return [self._row_to_record(r) for r in rows]
+            rows = await conn.execute_fetchall(sql.SQL_LIST, (limit, offset))
+        return [ImageRecord(*r) for r in rows]
 
     async def update_image(
         self,
@@ -96,7 +113,7 @@ class ImageDAL:
         *,
         image_filename: Optional[str] = None,
         image_description: Optional[str] = None,
-        image_thumbnail: Optional[bytes] = None,
+        image_thumbnail: Optional[Union[bytes, bytearray, memoryview]] = None,
         label: Optional[str] = None,
         reasoning: Optional[str] = None,
         user_documentation: Optional[str] = None,
@@ -104,45 +121,43 @@ class ImageDAL:
         """Update fields of an IMAGE row. Returns True if a row was changed."""
         updates = {
             "image_filename": image_filename, "image_description": image_description,
-            "image_thumbnail": image_thumbnail, "label": label,
-            "reasoning": reasoning, "user_documentation": user_documentation,
+            "label": label, "reasoning": reasoning, "user_documentation": user_documentation,
         }
+        if image_thumbnail is not None:
+            updates["thumbnail_path"] = self._name_for(image_thumbnail)
         fields = [f"{col} = ?" for col, val in updates.items() if val is not None]
-
         if not fields:
             return False
-
-        params = [val for val in updates.values() if val is not None]
-        params.append(image_id)
-        sql = f"UPDATE IMAGE SET {', '.join(fields)} WHERE id = ?"
-
-        async with self._db.connection() as conn:
-            await conn.execute(sql, tuple(params))
-            await conn.commit()
-            cur = await conn.execute("SELECT changes()")
-            changed = await cur.fetchone()
-            return bool(changed and changed[0] > 0)
+        params = [val for val in updates.values() if val is not None] + [image_id]
+
+        async with self._db.transaction() as conn:
+            if image_thumbnail is not None:
+                old_paths = await conn.execute_fetchall(sql.SQL_SELECT_THUMBNAIL_PATH, (image_id,))
+                await conn.execute(sql.SQL_DELETE_THUMBNAIL_BLOB, (image_id,))
+            query = f"UPDATE IMAGE SET {', '.join(fields)} WHERE id = ?"
+            changed = (await conn.execute(query, tuple(params))).rowcount > 0
+            if changed and image_thumbnail is not None:
+                await asyncio.to_thread(self._store.write, updates["thumbnail_path"], image_thumbnail)
+                await unlink_unreferenced(conn, self._store, (row[0] for row in old_paths))
+        self._evict(image_id)
+        return changed
 
     async def delete_image(self, image_id: int) -> bool:
         """Delete IMAGE row by id. Returns True if a row was deleted."""
-        async with self._db.connection() as conn:
-            await conn.execute("DELETE FROM IMAGE WHERE id = ?", (image_id,))
-            await conn.commit()
-            cur = await conn.execute("SELECT changes()")
-            changed = await cur.fetchone()
-            return bool(changed and changed[0] > 0)
-
-    @staticmethod
-    def _row_to_record(row: Sequence[object]) -> ImageRecord:
-        """Convert a DB row tuple into an ImageRecord."""
-        return ImageRecord(
-            id=row[0],
-            image_filename=row[1],
-            image_description=row[2],
-            image_thumbnail=row[3],
-            label=row[4],
-            reasoning=row[5],
-            user_documentation=row[6],
-            created_at=row[7],
-        )
-
+        async with self._db.transaction() as conn:
+            rows = await conn.execute_fetchall(sql.SQL_DELETE, (image_id,))
+            if self._store is not None:
+                await unlink_unreferenced(conn, self._store, (row[0] for row in rows))
+        self._evict(image_id)
+        return bool(rows)
+
+    def _name_for(self, data: Union[bytes, bytearray, memoryview]) -> str:
+        """Return the store file name for thumbnail bytes about to be written."""
+        if self._store is None:
+            raise ValueError("ImageDAL needs a thumbnail_store to save thumbnails.")
+        return self._store.name_for(data)
+
+    def _evict(self, image_id: int) -> None:
+        """Drop `image_id` from the thumbnail cache."""
+        if self._thumbnail_cache is not None:
+            self._thumbnail_cache.invalidate(image_id)
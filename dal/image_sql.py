@@ -0,0 +1,27 @@
+"""SQL text used by `ImageDAL`.
+
+Statements are built once at import so every call passes the identical string
+and hits sqlite3's per-connection prepared-statement cache.
+"""
+
+# IMAGE record columns in `ImageRecord` field order. Thumbnail bytes are never
+# read back through IMAGE: new ones are files named by `thumbnail_path`, and
+# legacy blobs live in IMAGE_THUMBNAIL, so row reads select NULL in the
+# `image_thumbnail` slot and listings never pull blobs.
+COLUMNS = (
+    "id", "image_filename", "image_description", "image_thumbnail",
+    "label", "reasoning", "user_documentation", "created_at", "thumbnail_path",
+)
+_COLUMN_LIST = ", ".join("NULL" if col == "image_thumbnail" else col for col in COLUMNS)
+_INSERT_COLUMNS = [col for col in COLUMNS[1:] if col != "image_thumbnail"]
+
+SQL_INSERT = (
+    f"INSERT INTO IMAGE ({', '.join(_INSERT_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_INSERT_COLUMNS))}) RETURNING id"
+)
+SQL_DELETE_THUMBNAIL_BLOB = "DELETE FROM IMAGE_THUMBNAIL WHERE image_id = ?"
+SQL_SELECT_THUMBNAIL_PATH = "SELECT thumbnail_path FROM IMAGE WHERE id = ?"
+SQL_SELECT_BY_ID = f"SELECT {_COLUMN_LIST} FROM IMAGE WHERE id = ?"
+SQL_SELECT_IN = f"SELECT {_COLUMN_LIST} FROM IMAGE WHERE id IN ({{}})"
+SQL_LIST = f"SELECT {_COLUMN_LIST} FROM IMAGE ORDER BY id DESC LIMIT ? OFFSET ?"
+SQL_DELETE = "DELETE FROM IMAGE WHERE id = ? RETURNING thumbnail_path"
@@ -0,0 +1,60 @@
+"""Async Data Access Layer for thumbnail lookups.
+
+Thumbnail endpoints only need the file name (or, for rows stored before
+thumbnails moved to disk, the IMAGE_THUMBNAIL blob) and cheap metadata to
+build HTTP cache validators, so these queries avoid loading full `ImageRecord`s.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+from utils.connection_provider import ConnectionProvider
+
+# Fixed SQL text so sqlite3's per-connection statement cache reuses the plan.
+_SQL_META = (
+    "SELECT i.thumbnail_path, length(t.png), i.created_at FROM IMAGE i "
+    "LEFT JOIN IMAGE_THUMBNAIL t ON t.image_id = i.id WHERE i.id = ?"
+)
+_SQL_BLOB = "SELECT png FROM IMAGE_THUMBNAIL WHERE image_id = ?"
+
+
+class ThumbnailDAL:
+    """Data access layer for IMAGE thumbnails.
+
+    The constructor accepts an `AsyncDatabaseInitializer` or any other
+    `ConnectionProvider` (async `connection()` and `transaction()` context
+    managers yielding an `aiosqlite.Connection`); this DAL only reads, so it
+    uses `connection()`.
+    """
+
+    def __init__(self, db_initializer: ConnectionProvider) -> None:
+        self._db = db_initializer
+
+    async def get_thumbnail_meta(self, image_id: int) -> Optional[Tuple[Optional[str], int, int]]:
+        """Return `(thumbnail_path, blob_length, created_at)` without reading any blob.
+
+        SQLite answers `length()` on a BLOB from the record header, so legacy
+        thumbnail bytes are not loaded.
+
+        Args:
+            image_id: Integer id of the image row.
+
+        Returns:
+            A `(path, length, created_at)` tuple, where `path` names the file in
+            the `ThumbnailStore` (None for legacy rows) and `length` is the legacy
+            blob size (0 when none is stored); or None if the image does not exist.
+        """
+        async with self._db.connection() as conn:
+            cur = await conn.execute(_SQL_META, (image_id,))
+            row = await cur.fetchone()
+        if row is None:
+            return None
+        return row[0], int(row[1] or 0), int(row[2] or 0)
+
+    async def get_thumbnail_blob(self, image_id: int) -> Optional[bytes]:
+        """Return the legacy PNG thumbnail blob for `image_id`, or None."""
+        async with self._db.connection() as conn:
+            cur = await conn.execute(_SQL_BLOB, (image_id,))
+            row = await cur.fetchone()
+        return row[0] if row else None
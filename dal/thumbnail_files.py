@@ -0,0 +1,37 @@
+"""Reference-checked removal of shared thumbnail files.
+
+Thumbnail files are content-addressed (see `utils.thumbnail_store`), so one
+file may back several IMAGE rows. Writers add and drop references inside the
+write transaction and call `unlink_unreferenced` before it commits: the
+`BEGIN IMMEDIATE` lock keeps any other writer, in this or another process,
+from pointing a new row at a file between the check and the unlink.
+"""
+
+import asyncio
+from typing import Iterable, Optional
+
+import aiosqlite
+
+from utils.thumbnail_store import ThumbnailStore
+
+_SQL_REFERENCED = "SELECT DISTINCT thumbnail_path FROM IMAGE WHERE thumbnail_path IN ({})"
+
+
+async def unlink_unreferenced(
+    conn: aiosqlite.Connection, store: ThumbnailStore, names: Iterable[Optional[str]]
+) -> None:
+    """Delete the files in `names` that no IMAGE row references any more.
+
+    Args:
+        conn: Connection inside the write transaction that dropped the references.
+        store: Store holding the files.
+        names: Candidate file names; None entries are ignored.
+    """
+    candidates = list(dict.fromkeys(filter(None, names)))
+    if not candidates:
+        return
+    query = _SQL_REFERENCED.format(", ".join("?" * len(candidates)))
+    referenced = {row[0] for row in await conn.execute_fetchall(query, candidates)}
+    orphans = [name for name in candidates if name not in referenced]
+    if orphans:
+        await asyncio.to_thread(store.delete, orphans)
@@ -1,18 +1,25 @@
 import asyncio
-import inspect
+import logging
 import os
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
-from openai import AsyncOpenAI
+import pybase64
+from PIL import __version__ as PILLOW_VERSION
 
 from routes.image_route import router as image_router
 from routes.opnote_route import router as opnote_router
+from services.openai.client_factory import close_openai_client, create_openai_client
+from utils.app_services import attach_services
 from utils.database_cleaner import DatabaseCleaner
 from utils.database_init import AsyncDatabaseInitializer
+from utils.static_files import CachedStaticFiles
+
+# The root logger is left unconfigured (WARNING), so startup diagnostics go
+# through uvicorn's error logger, which uvicorn configures at INFO.
+startup_logger = logging.getLogger("uvicorn.error")
 
 BASE_DIR = Path(__file__).resolve().parent
 PUBLIC_DIR = BASE_DIR / "public"
@@ -29,32 +36,37 @@ async def lifespan(app: FastAPI):
       - the SQLite database schema at DATABASE_DIR/app.db
       - periodic cleanup of stale IMAGE rows
       - the OpenAI async client
+      - shared DAL/service instances (see utils.app_services)
     Resources are attached to `app.state`.
     """
+    # Pillow-SIMD reports a "*.postN" version; log it so deployments can
+    # confirm the vectorized resize build backing ThumbnailGenerator is active.
+    startup_logger.info("Pillow version: %s", PILLOW_VERSION)
+    # pybase64 picks its SIMD code path (AVX2/SSE4/...) at import time.
+    startup_logger.info("pybase64 version: %s", pybase64.get_version())
+
     # Initialize DB using DATABASE_DIR only.
     db_initializer = AsyncDatabaseInitializer()
 
     await db_initializer.ensure_database()
     app.state.db_initializer = db_initializer
 
+    # One shared client/connection pool for every OpenAI-backed service.
+    openai_client = create_openai_client()
+    app.state.openai_client = openai_client
+    attach_services(app, db_initializer, openai_client)
+    await app.state.thumb_pool.warm()
+
     # Kick off cleanup and a background task to keep entries fresh.
-    cleaner = DatabaseCleaner(db_initializer)
+    cleaner = DatabaseCleaner(
+        db_initializer,
+        thumbnail_cache=app.state.thumbnail_cache,
+        thumbnail_store=app.state.thumbnail_store,
+    )
     await cleaner.prune_expired_images()
     db_cleanup_task = asyncio.create_task(cleaner.run_periodic_cleanup())
     app.state.db_cleanup_task = db_cleanup_task
 
-    # Initialize OpenAI async client
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    if not openai_api_key:
-        raise RuntimeError("OPENAI_API_KEY environment variable is not set")
-
-    try:
-        openai_client = AsyncOpenAI()
-    except Exception as exc:
-        raise RuntimeError("Failed to initialize OpenAI Async client") from exc
-
-    app.state.openai_client = openai_client
-
     try:
         yield
     finally:
@@ -66,21 +78,13 @@ async def lifespan(app: FastAPI):
             except asyncio.CancelledError:
                 pass
 
-        # Gracefully close the OpenAI client if it exposes a close/aclose method.
+        await app.state.image_loader.close()
+        app.state.thumb_pool.shutdown()
+        await db_initializer.close()
+
         client = getattr(app.state, "openai_client", None)
         if client is not None:
-            aclose = getattr(client, "aclose", None) or getattr(client, "close", None)
-            if aclose is not None:
-                try:
-                    if inspect.iscoroutinefunction(aclose):
-                        await aclose()
-                    else:
-                        result = aclose()
-                        if inspect.isawaitable(result):
-                            await result
-                except Exception:
-                    # Ignore shutdown errors to avoid masking more important issues.
-                    pass
+            await close_openai_client(client)
 
 
 def create_app() -> FastAPI:
@@ -91,17 +95,21 @@ def create_app() -> FastAPI:
 
     # Serve static assets from the public directory, if it exists.
     if PUBLIC_DIR.exists():
-        app.mount("/public", StaticFiles(directory=PUBLIC_DIR), name="public")
+        app.mount("/public", CachedStaticFiles(directory=PUBLIC_DIR), name="public")
+
+    # Resolve the index page once; the handler then never stats for existence.
+    index_path = PUBLIC_DIR / "index.html"
+    has_index = index_path.is_file()
 
     @app.get("/", include_in_schema=False)
     async def serve_index():
         """
         Serve the frontend index page from the public directory.
         """
-        index_path = PUBLIC_DIR / "index.html"
-        if not index_path.exists():
+        if not has_index:
             raise HTTPException(status_code=404, detail="Frontend not found")
-        return FileResponse(index_path)
+        # Always revalidate so frontend deploys are picked up immediately.
+        return FileResponse(index_path, media_type="text/html", headers={"Cache-Control": "no-cache"})
 
     @app.get("/health")
     async def health(request: Request):
@@ -123,3 +131,18 @@ def create_app() -> FastAPI:
 
 
 app = create_app()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop and httptools come with `uvicorn[standard]`. Workers each hold
+    # their own DB pools and thumbnail cache, so scale out via WEB_CONCURRENCY.
+    uvicorn.run(
+        "main:app",
+        host=os.getenv("HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="uvloop",
+        http="httptools",
+    )
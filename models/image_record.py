@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Union
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ImageRecord:
     """In-memory representation of a row in the IMAGE table.
 
@@ -12,18 +12,21 @@ class ImageRecord:
         id: Primary key (None for new records).
         image_filename: Filename stored for the image.
         image_description: Optional textual description.
-        image_thumbnail: Optional thumbnail bytes.
+        image_thumbnail: Optional thumbnail bytes (or buffer) to store; `ImageDAL` writes
+            them to its `ThumbnailStore`. Always None on records read back.
         label: Optional anatomical label classified from the image.
         reasoning: Optional model-provided explanation for the label.
         user_documentation: Optional user-provided context (text or transcribed dictation).
         created_at: Unix timestamp (seconds) when the row was inserted.
+        thumbnail_path: Name of the thumbnail file in the `ThumbnailStore`, if stored on disk.
     """
 
     id: Optional[int]
     image_filename: str
     image_description: Optional[str] = None
-    image_thumbnail: Optional[bytes] = None
+    image_thumbnail: Optional[Union[bytes, bytearray, memoryview]] = None
     label: Optional[str] = None
     reasoning: Optional[str] = None
     user_documentation: Optional[str] = None
     created_at: Optional[int] = None
+    thumbnail_path: Optional[str] = None
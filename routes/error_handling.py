@@ -0,0 +1,31 @@
+"""Shared error translation for route handlers."""
+
+import functools
+import logging
+from typing import Any, Awaitable, Callable, TypeVar
+
+from fastapi import HTTPException
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+def wrap_http_errors(fn: F) -> F:
+    """Turn unexpected exceptions raised by the async route `fn` into HTTP 500s.
+
+    `HTTPException`s pass through untouched. Anything else is logged with its
+    traceback and reported to the client only by exception type, so internal
+    messages are not leaked. `functools.wraps` keeps the signature FastAPI
+    uses for dependency injection.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return await fn(*args, **kwargs)
+        except HTTPException:
+            raise
+        except Exception as exc:
+            logging.exception("Unhandled error in %s", fn.__name__)
+            raise HTTPException(status_code=500, detail=type(exc).__name__) from exc
+
+    return wrapper  # type: ignore[return-value]
@@ -1,10 +1,62 @@
-from fastapi import APIRouter, UploadFile, File, Request, HTTPException, Form
-from controllers.image_controller import upload_image, get_thumbnail
+from fastapi import APIRouter, UploadFile, File, Request, Form
+from pydantic import BaseModel
+from typing import Optional
+
+from controllers.image_controller import upload_image
+from controllers.thumbnail_controller import get_thumbnail
+from routes.error_handling import wrap_http_errors
 
 router = APIRouter()
 
 
-@router.post("/images")
+class CostBreakdown(BaseModel):
+    """Estimated OpenAI cost of one classification, in USD.
+
+    Attributes:
+        model: Model whose pricing was applied.
+        input_tokens: Prompt tokens billed.
+        output_tokens: Completion tokens billed.
+        input_cost: Cost of the input tokens.
+        output_cost: Cost of the output tokens.
+        total_cost: Sum of `input_cost` and `output_cost`.
+    """
+
+    model: str
+    input_tokens: int
+    output_tokens: int
+    input_cost: float
+    output_cost: float
+    total_cost: float
+
+
+class ImageUploadResponse(BaseModel):
+    """Result of `POST /images`: the stored image id and its classification.
+
+    Attributes:
+        id: Primary key of the new IMAGE row.
+        label: Classified anatomical location or finding.
+        reasoning: Model's rationale for `label`.
+        image_description: Model-generated description of the image.
+        input_tokens: Prompt tokens used by the classification.
+        output_tokens: Completion tokens used by the classification.
+        latency: Classification wall time in seconds.
+        cost: Estimated cost of the classification.
+    """
+
+    id: int
+    label: Optional[str] = None
+    reasoning: Optional[str] = None
+    image_description: Optional[str] = None
+    input_tokens: int
+    output_tokens: int
+    latency: float
+    cost: CostBreakdown
+
+
+# A response_model lets FastAPI serialize straight to JSON bytes in
+# pydantic-core instead of jsonable_encoder + json.dumps.
+@router.post("/images", response_model=ImageUploadResponse)
+@wrap_http_errors
 async def post_image(
     request: Request,
     file: UploadFile = File(...),
@@ -12,22 +64,11 @@ async def post_image(
     audio_file: UploadFile = File(None),
 ):
     """Accept an uploaded image file and optional text/audio, then return classification + metadata."""
-    try:
-        result = await upload_image(request, file, text_input, audio_file)
-    except HTTPException:
-        raise
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=str(exc))
-    return result
-
+    return await upload_image(request, file, text_input, audio_file)
 
 
 @router.get("/images/{image_id}/thumbnail")
+@wrap_http_errors
 async def get_image_thumbnail(request: Request, image_id: int):
-    """Return the PNG thumbnail bytes for the specified image id."""
-    try:
-        return await get_thumbnail(request, image_id)
-    except HTTPException:
-        raise
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=str(exc))
+    """Return the thumbnail image (or 304 Not Modified) for the specified image id."""
+    return await get_thumbnail(request, image_id)
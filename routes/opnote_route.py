@@ -1,24 +1,48 @@
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List
 
-from controllers.opnote_controller import generate_opnote
+from controllers.opnote_controller import generate_opnote, stream_opnote
+from routes.error_handling import wrap_http_errors
 
 router = APIRouter()
 
 
 class OpnoteRequest(BaseModel):
+    """Body of `POST /opnotes` and `POST /opnotes/stream`.
+
+    Attributes:
+        base_opnote: User's operative note template (may be empty).
+        image_ids: IMAGE ids to describe, in display order.
+    """
+
     base_opnote: str = ""
     image_ids: List[int] = []
 
 
-@router.post("/opnotes")
+class OpnoteResponse(BaseModel):
+    """Result of `POST /opnotes`.
+
+    Attributes:
+        operative_note: The generated operative note in Markdown.
+    """
+
+    operative_note: str
+
+
+@router.post("/opnotes", response_model=OpnoteResponse)
+@wrap_http_errors
 async def post_opnote(request: Request, payload: OpnoteRequest):
     """Generate an operative note from the provided base note and image ids."""
-    try:
-        result = await generate_opnote(request, payload.base_opnote, payload.image_ids)
-    except HTTPException:
-        raise
-    except Exception as exc:
-        raise HTTPException(status_code=500, detail=str(exc))
-    return result
+    return await generate_opnote(request, payload.base_opnote, payload.image_ids)
+
+
+@router.post("/opnotes/stream")
+@wrap_http_errors
+async def post_opnote_stream(request: Request, payload: OpnoteRequest):
+    """Stream the operative note as Server-Sent Events while it is generated."""
+    events = await stream_opnote(request, payload.base_opnote, payload.image_ids)
+    return StreamingResponse(
+        events, media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
+    )
@@ -9,11 +9,16 @@ template structure.
 
 import logging
 import time
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from openai import AsyncOpenAI
 
 from models.image_record import ImageRecord
+from services.openai.llm_cache import LLMCache
+from services.openai.media_inputs import text_message
+from services.openai.opnote_context import build_context_note
+from services.openai.response_parser import extract_output_text
+from services.openai.single_flight import SingleFlight
 
 
 class OperativeNoteGenerator:
@@ -36,10 +41,18 @@ class OperativeNoteGenerator:
         - Return only the Markdown note (no explanatory text).
         """
 
-    def __init__(self, client: AsyncOpenAI) -> None:
+    MODEL = "gpt-5"
+
+    # Built once: the constant prefix is byte-identical on every call, which
+    # lets OpenAI's automatic prompt caching bill it at the cached rate.
+    _STATIC_MESSAGES = (text_message("system", SYSTEM_PROMPT), text_message("user", USER_INSTRUCTIONS))
+
+    def __init__(self, client: AsyncOpenAI, cache: Optional[LLMCache] = None) -> None:
         if client is None:
             raise ValueError("OpenAI AsyncOpenAI client is required.")
         self.client = client
+        self.cache = cache
+        self._inflight = SingleFlight()
 
     async def generate_opnote(
         self,
@@ -53,89 +66,94 @@ class OperativeNoteGenerator:
             images: List of ImageRecord objects.
             base_opnote: User-provided operative note text (used as the template).
             template: Optional template override (defaults to base_opnote).
-            max_output_tokens: LLM token limit.
 
         Returns:
             A final operative note in markdown.
         """
-        start = time.time()
-
-        template_text = (template if template is not None else base_opnote) or ""
-        template_text = template_text.strip()
-
-        image_sections = [
-            self._format_image_block(index, image) for index, image in enumerate(images, start=1)
-        ]
-        image_details = "\n\n".join(image_sections) if image_sections else "No images provided."
+        start = time.monotonic()
+        context_note, key = self._prepare(images, base_opnote, template)
+
+        # Regenerating an unchanged note is common while editing; identical
+        # prompts + context return the previously generated note, and identical
+        # concurrent requests share one API call.
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logging.info("Operative note served from cache")
+                return cached
+
+        md_output = await self._inflight.run(key, lambda: self._request_note(context_note))
+        if self.cache is not None:
+            self.cache.set(key, md_output)
+
+        latency = time.monotonic() - start
+        logging.info(f"Operative note generation latency: {latency:.3f}s")
 
-        context_parts = []
-        if template_text:
-            context_parts.append("## User-Provided Operative Note Template\n" + template_text)
-        context_parts.append("## Image Details\n" + image_details)
+        return md_output
 
-        context_note = "\n\n".join(context_parts)
+    async def stream_opnote(
+        self,
+        images: List[ImageRecord],
+        base_opnote: Optional[str] = None,
+        template: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Yield the operative note as Markdown text deltas while it is generated.
 
+        Takes the same arguments as `generate_opnote`. Closing the iterator
+        early (e.g. on client disconnect) closes the upstream stream, so no
+        further output tokens are produced. Only a note whose stream ended with
+        `response.completed` and produced text is cached.
+        """
+        context_note, key = self._prepare(images, base_opnote, template)
+        cached = self.cache.get(key) if self.cache is not None else None
+        if cached is not None:
+            yield cached
+            return
+
+        parts: List[str] = []
+        completed = False
+        async with self.client.responses.stream(
+            model=self.MODEL, input=self._build_input(context_note)
+        ) as stream:
+            async for event in stream:
+                if event.type == "response.output_text.delta":
+                    parts.append(event.delta)
+                    yield event.delta
+                elif event.type == "response.completed":
+                    completed = True
+        # Truncated (response.incomplete) or empty output must not be served
+        # to later regenerations of the same note.
+        note = "".join(parts)
+        if self.cache is not None and completed and note:
+            self.cache.set(key, note)
+
+    def _prepare(
+        self, images: List[ImageRecord], base_opnote: Optional[str], template: Optional[str]
+    ) -> Tuple[str, str]:
+        """Return the context message and cache key for a generation request."""
+        template_text = ((template if template is not None else base_opnote) or "").strip()
+        context_note = build_context_note(images, template_text)
+        key = LLMCache.make_key(
+            sys=self.SYSTEM_PROMPT, usr=self.USER_INSTRUCTIONS, ctx=context_note, model=self.MODEL
+        )
+        return context_note, key
+
+    def _build_input(self, context_note: str) -> List[Dict[str, Any]]:
+        """Assemble the system, instruction and context messages for the model."""
+        return [*self._STATIC_MESSAGES, text_message("user", context_note)]
+
+    async def _request_note(self, context_note: str) -> str:
+        """Call the Responses API for `context_note` and return the markdown note."""
         try:
             response = await self.client.responses.create(
-                model="gpt-5",
-                input=[
-                    {
-                        "type": "message",
-                        "role": "system",
-                        "content": [{"type": "input_text", "text": self.SYSTEM_PROMPT}],
-                    },
-                    {
-                        "type": "message",
-                        "role": "user",
-                        "content": [{"type": "input_text", "text": self.USER_INSTRUCTIONS}],
-                    },
-                    {
-                        "type": "message",
-                        "role": "user",
-                        "content": [{"type": "input_text", "text": context_note}],
-                    },
-                ],
+                model=self.MODEL, input=self._build_input(context_note)
             )
         except Exception as exc:
             logging.error(f"OpenAI Responses API error: {exc}")
             raise
 
-        md_output = self._extract_markdown(response)
-
-        latency = time.time() - start
-        logging.info(f"Operative note generation latency: {latency:.3f}s")
-
-        return md_output
-
-    @staticmethod
-    def _extract_markdown(response) -> str:
-        """Pull the markdown text out of a Responses API result."""
-        try:
-            for item in response.output:
-                if getattr(item, "type", None) != "message":
-                    continue
-                for content in getattr(item, "content", []):
-                    if content.get("type") == "output_text":
-                        return content.get("text")
-        except Exception as exc:
-            logging.error(f"Error parsing response output: {exc}")
-
-        return getattr(response, "output_text", None) or str(response)
-
-    @staticmethod
-    def _format_image_block(index: int, image: ImageRecord) -> str:
-        """Format a single image entry for the model context."""
-        label = image.label or "Not provided"
-        description = image.image_description or "Not provided"
-        reasoning = image.reasoning or "Not provided"
-        documentation = image.user_documentation or "Not provided"
-        image_id = f" (ID {image.id})" if image.id is not None else ""
-
-        lines = [
-            f"Image {index}{image_id}",
-            f"Generated Label: {label}",
-            f"Generated Description: {description}",
-            f"Generated Reasoning: {reasoning}",
-            f"User Provided Documentation: {documentation}",
-        ]
-        return "\n".join(lines)
+        note = extract_output_text(response)
+        if not note:
+            # Raising keeps an empty/unparseable reply out of the cache.
+            raise RuntimeError("OpenAI response contained no operative note text.")
+        return note
@@ -0,0 +1,53 @@
+"""Construction and shutdown of the process-wide AsyncOpenAI client.
+
+One client (and therefore one HTTP connection pool) is created in the app
+lifespan and shared by every OpenAI-backed service, so requests reuse warm
+TLS connections to the API instead of handshaking per call.
+"""
+
+import importlib.util
+import inspect
+import os
+
+import httpx
+from openai import AsyncOpenAI
+
+# HTTP/2 multiplexes concurrent calls over one connection; it needs the `h2`
+# package (`httpx[http2]`), so fall back to HTTP/1.1 keep-alive without it.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=200)
+_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+
+def create_openai_client() -> AsyncOpenAI:
+    """Return an `AsyncOpenAI` backed by a pooled, long-lived `httpx.AsyncClient`.
+
+    Raises:
+        RuntimeError: If OPENAI_API_KEY is unset or the client cannot be built.
+    """
+    if not os.getenv("OPENAI_API_KEY"):
+        raise RuntimeError("OPENAI_API_KEY environment variable is not set")
+
+    try:
+        http_client = httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=_LIMITS, timeout=_TIMEOUT)
+        return AsyncOpenAI(http_client=http_client)
+    except Exception as exc:
+        raise RuntimeError("Failed to initialize OpenAI Async client") from exc
+
+
+async def close_openai_client(client) -> None:
+    """Close `client` (and its connection pool), ignoring shutdown errors."""
+    aclose = getattr(client, "aclose", None) or getattr(client, "close", None)
+    if aclose is None:
+        return
+    try:
+        if inspect.iscoroutinefunction(aclose):
+            await aclose()
+        else:
+            result = aclose()
+            if inspect.isawaitable(result):
+                await result
+    except Exception:
+        # Ignore shutdown errors to avoid masking more important issues.
+        pass
@@ -27,6 +27,12 @@ class CostGenerator:
 				When omitted, `DEFAULT_PRICING` will be used.
 		"""
 		self.pricing = pricing or dict(self.DEFAULT_PRICING)
+		# Per-token (input, output) rates, keyed by lower-cased model name, so
+		# estimate() does two multiplies instead of per-call divides.
+		self._rates = {
+			name.lower(): (rates["input_per_1k"] / 1000.0, rates["output_per_1k"] / 1000.0)
+			for name, rates in self.pricing.items()
+		}
 
 	def estimate(self, input_tokens: int, output_tokens: int, model: str) -> dict:
 		"""Estimate cost for a single API call.
@@ -46,13 +52,15 @@ class CostGenerator:
 		if input_tokens < 0 or output_tokens < 0:
 			raise ValueError("Token counts must be non-negative integers.")
 
-		model = model.lower()
-		if model not in self.pricing:
-			raise ValueError(f"Unsupported model '{model}'. Supported: {', '.join(self.pricing.keys())}")
+		rates = self._rates.get(model)
+		if rates is None:
+			model = model.lower()
+			rates = self._rates.get(model)
+			if rates is None:
+				raise ValueError(f"Unsupported model '{model}'. Supported: {', '.join(self.pricing.keys())}")
 
-		rates = self.pricing[model]
-		input_cost = (input_tokens / 1000.0) * rates["input_per_1k"]
-		output_cost = (output_tokens / 1000.0) * rates["output_per_1k"]
+		input_cost = input_tokens * rates[0]
+		output_cost = output_tokens * rates[1]
 		total = input_cost + output_cost
 
 		return {
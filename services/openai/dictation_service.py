@@ -1,6 +1,5 @@
 """Audio transcription helper built on OpenAI's transcription models."""
 
-import io
 import logging
 
 from openai import AsyncOpenAI
@@ -22,13 +21,12 @@ class DictationService:
         if not audio_bytes:
             raise ValueError("audio_bytes must contain data for transcription.")
 
-        audio_file = io.BytesIO(audio_bytes)
-        audio_file.name = filename
-
         try:
+            # The SDK accepts a (filename, bytes) tuple, so the upload is sent
+            # as-is without wrapping it in a BytesIO per request.
             response = await self.client.audio.transcriptions.create(
                 model=TRANSCRIBE_MODEL,
-                file=audio_file,
+                file=(filename, audio_bytes),
             )
         except Exception as exc:
             logging.error("OpenAI transcription request failed: %s", exc)
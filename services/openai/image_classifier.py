@@ -1,5 +1,7 @@
 """Description: Multimodal image classification service using OpenAI's Responses API."""
 
+import asyncio
+import hashlib
 import logging
 import time
 from typing import Any, Dict, List, Optional
@@ -7,10 +9,17 @@ from typing import Any, Dict, List, Optional
 from openai import AsyncOpenAI
 
 from services.openai.dictation_service import DictationService
-from services.openai.image_prompts import build_system_prompt, build_user_prompt
+from services.openai.image_prompts import build_system_prompt, build_user_message
 from services.openai.image_schema import FUNCTION_DEFINITION, FUNCTION_NAME
-from services.openai.media_inputs import build_inputs
+from services.openai.media_inputs import build_inputs, text_message
 from services.openai.response_parser import extract_usage, parse_function_call
+from services.openai.single_flight import SingleFlight
+from services.openai.vision_image import vision_data_url
+
+# Request constants shared by every classification call.
+_MODEL = "gpt-5"
+_TOOLS = [FUNCTION_DEFINITION]
+_TOOL_CHOICE = {"type": "function", "name": FUNCTION_NAME}
 
 
 class ImageClassifier:
@@ -22,7 +31,9 @@ class ImageClassifier:
             raise ValueError("OpenAI client must be provided.")
         self.client = client
         self.system_prompt = build_system_prompt()
+        self._system_message = text_message("system", self.system_prompt)
         self.dictation = DictationService(client)
+        self._inflight = SingleFlight()
 
     async def classify_media(
         self,
@@ -31,24 +42,56 @@ class ImageClassifier:
         text_input: Optional[str] = None,
         audio_bytes: Optional[bytes] = None,
     ) -> Dict[str, Any]:
-        """Classify an image using optional text and audio context."""
-        start_time = time.time()
+        """Classify an image using optional text and audio context.
+
+        `image_bytes` is the binary image; it is base64-encoded once when the
+        request payload is built.
+
+        Identical concurrent requests (same image, text and audio, e.g. a
+        clinician retrying an upload) share a single API call.
+        """
+        digest = hashlib.sha256(image_bytes)
+        digest.update(b"\0" + (text_input or "").encode("utf-8"))
+        digest.update(b"\0" + hashlib.sha256(audio_bytes or b"").digest())
+        result = await self._inflight.run(
+            digest.hexdigest(),
+            lambda: self._classify(image_bytes, text_input=text_input, audio_bytes=audio_bytes),
+        )
+        # Each caller gets its own dict so callers cannot affect each other.
+        return dict(result)
+
+    async def _classify(
+        self,
+        image_bytes: bytes,
+        *,
+        text_input: Optional[str] = None,
+        audio_bytes: Optional[bytes] = None,
+    ) -> Dict[str, Any]:
+        """Run transcription, the Responses API call and parsing for one request."""
+        start_time = time.monotonic()
         audio_transcript: Optional[str] = None
         audio_present = bool(audio_bytes)
+        # Resize + base64 are CPU-bound; run them in a worker thread while the
+        # (optional) transcription request is in flight.
+        image_task = asyncio.ensure_future(asyncio.to_thread(vision_data_url, image_bytes))
         if audio_bytes:
-            audio_transcript = await self.dictation.transcribe(audio_bytes)
+            try:
+                audio_transcript = await self.dictation.transcribe(audio_bytes)
+            except BaseException:
+                image_task.cancel()
+                raise
+        image_url = await image_task
 
-        user_prompt = build_user_prompt(bool(text_input), audio_present)
         inputs = build_inputs(
-            self.system_prompt,
-            user_prompt,
+            self._system_message,
+            build_user_message(bool(text_input), audio_present),
             text_input=text_input,
             audio_transcript=audio_transcript,
-            image_bytes=image_bytes,
+            image_url=image_url,
         )
         response = await self._create_response(inputs)
         result = self._parse_response(response)
-        result["latency"] = time.time() - start_time
+        result["latency"] = time.monotonic() - start_time
         result["audio_transcript"] = audio_transcript
         result.update(extract_usage(response))
         return result
@@ -57,10 +100,7 @@ class ImageClassifier:
         """Send the multimodal request to the OpenAI Responses API."""
         try:
             return await self.client.responses.create(
-                model="gpt-5",
-                input=inputs,
-                tools=[FUNCTION_DEFINITION],
-                tool_choice={"type": "function", "name": FUNCTION_NAME},
+                model=_MODEL, input=inputs, tools=_TOOLS, tool_choice=_TOOL_CHOICE
             )
         except Exception as exc:
             logging.error("Error during OpenAI Responses API call: %s", exc)
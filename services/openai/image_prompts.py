@@ -1,5 +1,11 @@
 """Prompt builders for multimodal endoscopic classification."""
 
+from functools import lru_cache
+from typing import Any, Dict
+
+from services.openai.media_inputs import text_message
+
+
 def build_system_prompt() -> str:
     """Return the system prompt for the classifier."""
     return (
@@ -10,6 +16,8 @@ def build_system_prompt() -> str:
     )
 
 
+# Only four modality combinations exist, so each prompt is built once.
+@lru_cache(maxsize=4)
 def build_user_prompt(text_present: bool, audio_present: bool) -> str:
     """Return the user prompt tailored to available modalities."""
     supplements = []
@@ -29,3 +37,12 @@ def build_user_prompt(text_present: bool, audio_present: bool) -> str:
         "Include a written description of the image for annotation and findings documentation. "
         f"Use the image{supplement_text} to inform your decision."
     )
+
+
+@lru_cache(maxsize=4)
+def build_user_message(text_present: bool, audio_present: bool) -> Dict[str, Any]:
+    """Return the shared user-prompt input message for the given modalities.
+
+    The cached dict is reused across requests and must not be mutated.
+    """
+    return text_message("user", build_user_prompt(text_present, audio_present))
@@ -0,0 +1,63 @@
+"""Exact-match, in-process cache for LLM responses.
+
+Keys are SHA-256 digests of the full request (prompts, context and model), so
+a hit is only possible for byte-identical requests. There is deliberately no
+similarity tier: two clinically different notes can look "similar" to an
+embedding model, and serving one for the other would be unsafe.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson is listed in requirements; stdlib json still works
+    orjson = None
+
+
+class LLMCache:
+    """Bounded TTL + LRU cache mapping request digests to model outputs.
+
+    Methods never await, so they are atomic on the event loop.
+
+    Args:
+        ttl_seconds: How long an entry stays valid after it is stored.
+        max_entries: Maximum number of cached responses.
+    """
+
+    def __init__(self, ttl_seconds: float = 7 * 86_400, max_entries: int = 256) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """Return a stable SHA-256 hex digest of the JSON-serializable `parts`."""
+        if orjson is not None:
+            # orjson emits compact UTF-8 bytes directly; no separate encode pass.
+            payload = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)
+        else:
+            payload = json.dumps(parts, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for `key`, or None if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store `value` under `key`, evicting the least recently used entries."""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -2,17 +2,27 @@
 
 from typing import Any, Dict, List, Optional
 
+import pybase64
+
+_JPEG_PREFIX = "data:image/jpeg;base64,"
+_PNG_PREFIX = "data:image/png;base64,"
+_PNG_MAGIC = b"\x89P"
+
+
+def text_message(role: str, text: str) -> Dict[str, Any]:
+    """Wrap `text` as a Responses API input message for `role`."""
+    return {"type": "message", "role": role, "content": [{"type": "input_text", "text": text}]}
+
 
 def to_image_data_url(image_bytes: bytes) -> str:
-    """Convert base64 image bytes into a data URL suitable for vision input."""
-    try:
-        b64_str = image_bytes.decode("utf-8")
-    except Exception as exc:
-        raise ValueError("Image bytes must be base64-encoded UTF-8.") from exc
-    # Debug: indicate that an image was provided and converted
-    if b64_str:
-        print("image added")
-    return f"data:image/jpeg;base64,{b64_str}"
+    """Convert binary image bytes into a data URL suitable for vision input.
+
+    The payload is base64-encoded exactly once, straight to `str`, so no
+    intermediate bytes copy or UTF-8 validation pass is needed. The MIME type
+    comes from a two-byte magic sniff (PNG, otherwise JPEG).
+    """
+    prefix = _PNG_PREFIX if image_bytes[:2] == _PNG_MAGIC else _JPEG_PREFIX
+    return prefix + pybase64.b64encode_as_string(image_bytes)
 
 
 def build_user_content(
@@ -21,21 +31,9 @@ def build_user_content(
     """Compose user messages so each modality is a distinct input entry."""
     messages: List[Dict[str, Any]] = []
     if text_input:
-        # Debug: indicate that text input was provided
-        print("Text added")
-        messages.append(
-            {"type": "message", "role": "user", "content": [{"type": "input_text", "text": text_input}]}
-        )
+        messages.append(text_message("user", text_input))
     if audio_transcript:
-        print("Audio transcript added")
-        messages.append(
-            {
-                "type": "message",
-                "role": "user",
-                "content": [{"type": "input_text", "text": f"Audio narration (transcribed): {audio_transcript}"}],
-            },
-        )
-
+        messages.append(text_message("user", f"Audio narration (transcribed): {audio_transcript}"))
     messages.append(
         {"type": "message", "role": "user", "content": [{"type": "input_image", "image_url": image_url}]}
     )
@@ -43,22 +41,20 @@ def build_user_content(
 
 
 def build_inputs(
-    system_prompt: str,
-    user_prompt: str,
+    system_message: Dict[str, Any],
+    user_message: Dict[str, Any],
     *,
     text_input: Optional[str],
     audio_transcript: Optional[str],
-    image_bytes: bytes,
+    image_url: str,
 ) -> List[Dict[str, Any]]:
-    """Build the Responses API input array with each modality separated."""
-    image_url = to_image_data_url(image_bytes)
-    inputs: List[Dict[str, Any]] = [
-        {
-            "type": "message",
-            "role": "system",
-            "content": [{"type": "input_text", "text": system_prompt}],
-        },
-        {"type": "message", "role": "user", "content": [{"type": "input_text", "text": user_prompt}]},
-    ]
+    """Build the Responses API input array with each modality separated.
+
+    `system_message` and `user_message` are the caller's prebuilt, shared
+    entries; the SDK only reads them, so only the per-request text, transcript
+    and image leaves are allocated here. Reusing one object also keeps the
+    prompt prefix byte-identical across calls for prompt caching.
+    """
+    inputs: List[Dict[str, Any]] = [system_message, user_message]
     inputs.extend(build_user_content(image_url, text_input, audio_transcript))
     return inputs
@@ -0,0 +1,43 @@
+"""Build the model context for operative note generation from image records."""
+
+from typing import List
+
+from models.image_record import ImageRecord
+
+
+def format_image_block(index: int, image: ImageRecord) -> str:
+    """Format a single image entry for the model context."""
+    image_id = f" (ID {image.id})" if image.id is not None else ""
+    # One f-string per image: no per-field list and inner join.
+    return (
+        f"Image {index}{image_id}\n"
+        f"Generated Label: {image.label or 'Not provided'}\n"
+        f"Generated Description: {image.image_description or 'Not provided'}\n"
+        f"Generated Reasoning: {image.reasoning or 'Not provided'}\n"
+        f"User Provided Documentation: {image.user_documentation or 'Not provided'}"
+    )
+
+
+def build_context_note(images: List[ImageRecord], template_text: str) -> str:
+    """Combine the user template and formatted image details into one context message.
+
+    Args:
+        images: Image records to describe, in display order.
+        template_text: Stripped user template (may be empty).
+
+    Returns:
+        Markdown context with an optional template section and an image section.
+    """
+    parts = []
+    if template_text:
+        parts.append("## User-Provided Operative Note Template\n" + template_text)
+    if images:
+        # Prefix the first block with the section header so the whole note is
+        # assembled by a single join.
+        blocks = [format_image_block(index, image) for index, image in enumerate(images, start=1)]
+        blocks[0] = "## Image Details\n" + blocks[0]
+        parts.extend(blocks)
+    else:
+        parts.append("## Image Details\nNo images provided.")
+
+    return "\n\n".join(parts)
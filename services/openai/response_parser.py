@@ -1,19 +1,21 @@
 """Helpers to parse Responses API outputs."""
 
-import json
+import logging
 from typing import Any, Dict, Optional
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is listed in requirements; stdlib json still works
+    from json import loads as _json_loads
+
 
 def parse_function_call(response: Any, *, tool_name: str) -> Dict[str, str]:
     """Extract the function call arguments for the specified tool name."""
-    for item in getattr(response, "output", []):
+    # With a forced tool_choice the call is almost always the first item. Each
+    # item is checked on its own, so one malformed item does not end the scan.
+    for item in getattr(response, "output", None) or ():
         if getattr(item, "type", None) == "function_call" and getattr(item, "name", None) == tool_name:
-            args = json.loads(getattr(item, "arguments", "{}") or "{}")
-            return {
-                "label": args.get("label", ""),
-                "reasoning": args.get("reasoning", ""),
-                "image_description": args.get("image_description", ""),
-            }
+            return _call_fields(item)
     raise RuntimeError(f"No function_call output for '{tool_name}' found in Responses API output.")
 
 
@@ -24,3 +26,44 @@ def extract_usage(response: Any) -> Dict[str, Optional[int]]:
         "input_tokens": getattr(usage, "input_tokens", None) if usage else None,
         "output_tokens": getattr(usage, "output_tokens", None) if usage else None,
     }
+
+
+def extract_output_text(response: Any) -> Optional[str]:
+    """Pull the message text out of a Responses API result.
+
+    Returns:
+        The first `output_text` part (or the SDK's `output_text` aggregate), or
+        None when the response carries no text at all.
+    """
+    # Fast path: a plain reply is a single message whose first part is the text.
+    # Content parts are SDK models (no `.get`), so fields are read as attributes.
+    try:
+        first = response.output[0]
+        if first.type == "message":
+            content = first.content[0]
+            if getattr(content, "type", None) == "output_text":
+                return getattr(content, "text", None)
+    except Exception:
+        pass
+
+    try:
+        for item in response.output:
+            if getattr(item, "type", None) != "message":
+                continue
+            for content in getattr(item, "content", []):
+                if getattr(content, "type", None) == "output_text":
+                    return getattr(content, "text", None)
+    except Exception as exc:
+        logging.error(f"Error parsing response output: {exc}")
+
+    return getattr(response, "output_text", None) or None
+
+
+def _call_fields(item: Any) -> Dict[str, str]:
+    """Decode a function call's arguments into the classification fields."""
+    args = _json_loads(item.arguments or "{}")
+    return {
+        "label": args.get("label", ""),
+        "reasoning": args.get("reasoning", ""),
+        "image_description": args.get("image_description", ""),
+    }
@@ -0,0 +1,34 @@
+"""Collapse concurrent identical async calls into one shared execution."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Run at most one in-flight call per key; concurrent callers share its result.
+
+    The shared call runs as its own task and callers await it through
+    `asyncio.shield`, so a caller that is cancelled (e.g. a client disconnect)
+    does not cancel the request other callers are waiting on.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Await `factory()` for `key`, joining an identical call already running.
+
+        Args:
+            key: Identity of the request; equal keys must mean equal results.
+            factory: Zero-argument callable returning the awaitable to run.
+
+        Returns:
+            The result of the (possibly shared) call. Exceptions propagate to
+            every caller.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
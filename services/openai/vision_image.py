@@ -0,0 +1,51 @@
+"""Shrink uploaded images before they are sent to the vision model.
+
+Endoscopy frames are often far larger than the model needs; sending a
+bounded JPEG cuts image input tokens and the base64 payload size.
+"""
+
+import io
+
+from PIL import Image
+
+from services.openai.media_inputs import to_image_data_url
+
+MAX_EDGE = 1024
+JPEG_QUALITY = 85
+
+
+def downscale_for_vision(image_bytes: bytes, max_edge: int = MAX_EDGE) -> bytes:
+    """Return `image_bytes` re-encoded as JPEG if its long edge exceeds `max_edge`.
+
+    Images already within bounds, and payloads Pillow cannot read, are returned
+    unchanged so the model still sees exactly what was uploaded.
+
+    Args:
+        image_bytes: Encoded image file bytes (JPEG, PNG, ...).
+        max_edge: Maximum width/height in pixels after downscaling.
+
+    Returns:
+        The original bytes, or a smaller JPEG that fits within `max_edge`.
+    """
+    try:
+        img = Image.open(io.BytesIO(image_bytes))
+        if max(img.size) <= max_edge:
+            return image_bytes
+        # JPEG sources decode straight at a reduced DCT scale.
+        img.draft("RGB", (max_edge, max_edge))
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        img.thumbnail((max_edge, max_edge), Image.BICUBIC)
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+    except Exception:
+        return image_bytes
+    return out.getvalue()
+
+
+def vision_data_url(image_bytes: bytes) -> str:
+    """Downscale `image_bytes` if needed and return it as a base64 data URL.
+
+    CPU-bound (decode, resize, encode); callers run it in a worker thread.
+    """
+    return to_image_data_url(downscale_for_vision(image_bytes))
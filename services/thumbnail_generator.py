@@ -1,50 +1,117 @@
 """Thumbnail generator service.
 
 Provides a small OOP wrapper around Pillow to create thumbnails
-from image bytes (expected base64-encoded input). The resulting
-thumbnail will fit within 160x160 pixels and is returned as a
-base64-encoded PNG byte string.
+from image bytes. The resulting thumbnail will fit within 160x160
+pixels and is returned as encoded image bytes (or, for legacy callers,
+as a base64 string), JPEG by default. Transparent sources are flattened
+onto the background color first, so no alpha is carried into the output.
+
+The LANCZOS resample dominates runtime for large uploads; installing
+Pillow-SIMD in place of Pillow (see requirements.txt) accelerates it with
+SSE4/AVX2 kernels without any code change here.
 
 Public class: `ThumbnailGenerator`
 
 Example:
     tg = ThumbnailGenerator(max_size=(160, 160))
-    thumb_b64 = tg.create_thumbnail_from_base64(b64_input)
+    thumb = tg.create_thumbnail_from_bytes(image_bytes)
 """
 from __future__ import annotations
 
-import base64
 import io
 from typing import Tuple
 
+import pybase64
 from PIL import Image
 
 
 class ThumbnailGenerator:
     """Generate thumbnails from image bytes.
 
-    This class accepts base64-encoded image bytes (str or bytes) and
-    returns a base64-encoded PNG thumbnail that fits within the
-    configured `max_size` while preserving aspect ratio.
+    This class accepts raw image bytes (or base64-encoded image data via
+    `create_thumbnail_from_base64`) and returns a thumbnail that fits
+    within the configured `max_size` while preserving aspect ratio.
 
     Args:
         max_size: Maximum width and height for the thumbnail. Defaults to (160, 160).
         background: Optional background color used when converting images with alpha to RGB.
             If None, images with alpha are flattened against white.
+        format: Pillow format for opaque sources. JPEG (libjpeg-turbo) encodes
+            far faster and smaller than zlib-optimized PNG. Every source,
+            including ones with alpha, is flattened to RGB before encoding.
+        quality: JPEG quality (ignored for PNG).
     """
 
-    def __init__(self, max_size: Tuple[int, int] = (160, 160), background: Tuple[int, int, int] | None = None):
+    def __init__(
+        self,
+        max_size: Tuple[int, int] = (160, 160),
+        background: Tuple[int, int, int] | None = None,
+        format: str = "JPEG",
+        quality: int = 85,
+    ):
         self.max_size = max_size
         self.background = background or (255, 255, 255)
+        self.format = format
+        self.quality = quality
+
+    def create_thumbnail_from_bytes(self, raw: bytes) -> memoryview:
+        """Create a thumbnail from raw (binary) image bytes.
+
+        Args:
+            raw: Encoded image file bytes (JPEG, PNG, ...).
+
+        Returns:
+            A memoryview over the thumbnail encoded as `self.format`.
+
+        Raises:
+            ValueError: If the provided bytes cannot be opened as an image.
+        """
+        try:
+            src = Image.open(io.BytesIO(raw))
+        except Exception as exc:
+            raise ValueError("Decoded bytes are not a supported image format") from exc
+
+        # For JPEG sources, let libjpeg decode at the smallest DCT scale that still
+        # covers twice the target size, so full-resolution pixels are never
+        # materialized. This is a no-op for other formats.
+        src.draft("RGB", (self.max_size[0] * 2, self.max_size[1] * 2))
+
+        if src.mode == "RGB":
+            # Opaque (the common JPEG case): resize directly, nothing to composite.
+            src.thumbnail(self.max_size, Image.LANCZOS)
+            out = src
+        elif src.mode in ("RGBA", "LA", "PA") or "transparency" in src.info:
+            # Flatten alpha against the background color after resizing.
+            src = src.convert("RGBA")
+            src.thumbnail(self.max_size, Image.LANCZOS)
+            out = Image.new("RGB", src.size, self.background)
+            out.paste(src, mask=src.getchannel("A"))
+        else:
+            # L, CMYK, I, opaque P, ...: a plain conversion is enough.
+            src = src.convert("RGB")
+            src.thumbnail(self.max_size, Image.LANCZOS)
+            out = src
+
+        out_io = io.BytesIO()
+        if self.format == "JPEG":
+            out.save(out_io, format="JPEG", quality=self.quality, optimize=True, progressive=False)
+        else:
+            out.save(out_io, format=self.format, optimize=True)
+        # getbuffer() exposes the encoded image without the copy getvalue() makes;
+        # sqlite3 binds any buffer as a BLOB.
+        return out_io.getbuffer()
 
     def create_thumbnail_from_base64(self, data: str | bytes) -> str:
         """Create a thumbnail from base64-encoded image data.
 
+        Thin wrapper around `create_thumbnail_from_bytes` for callers that
+        still hold base64 payloads.
+
         Args:
             data: Base64-encoded image data (either `str` or `bytes`).
 
         Returns:
-            A base64-encoded PNG string of the thumbnail (UTF-8 string).
+            The base64-encoded thumbnail (see `create_thumbnail_from_bytes`).
 
         Raises:
             ValueError: If the provided data cannot be decoded or opened as an image.
@@ -55,29 +122,11 @@ class ThumbnailGenerator:
             data_bytes = data
 
         try:
-            raw = base64.b64decode(data_bytes, validate=True)
+            raw = pybase64.b64decode(data_bytes, validate=True)
         except Exception as exc:
             raise ValueError("Invalid base64 data provided") from exc
 
-        try:
-            src = Image.open(io.BytesIO(raw))
-        except Exception as exc:
-            raise ValueError("Decoded bytes are not a supported image format") from exc
-
-        # Convert to RGBA to preserve alpha if present, then flatten to RGB
-        if src.mode not in ("RGBA", "RGB"):
-            src = src.convert("RGBA")
-        else:
-            src = src.convert("RGBA")
-
-        src.thumbnail(self.max_size, Image.LANCZOS)
-
-        # Flatten alpha against the background color
-        background = Image.new("RGB", src.size, self.background)
-        background.paste(src, mask=src.split()[3])
-
-        out_io = io.BytesIO()
-        background.save(out_io, format="PNG", optimize=True)
-        out_bytes = out_io.getvalue()
-
-        return base64.b64encode(out_bytes).decode("utf-8")
+        # SIMD encode straight from the BytesIO buffer to str (no getvalue()
+        # copy, no bytes intermediate); release the export as soon as it is read.
+        with self.create_thumbnail_from_bytes(raw) as view:
+            return pybase64.b64encode_as_string(view)
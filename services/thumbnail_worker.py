@@ -0,0 +1,120 @@
+"""Process-pool entry point for thumbnail generation.
+
+Decoding, resampling and encoding hold the GIL for much of their runtime, so
+uploads hand the work to a `ThumbnailPool` (see `utils.app_services`) backed
+by worker processes instead of a thread. Functions here must stay top-level so
+they pickle.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, TypeVar
+
+from PIL import Image
+
+from services.thumbnail_generator import ThumbnailGenerator
+
+# One generator per worker process, built when the worker imports this module;
+# Image.init() registers every format plugin up front so the first job does
+# not pay for the lazy plugin import.
+Image.init()
+_GENERATOR = ThumbnailGenerator()
+
+T = TypeVar("T")
+
+
+def create_thumbnail_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return a process pool of `max_workers` processes for `make_thumbnail` jobs.
+
+    Workers are spawned rather than forked: the server process already runs
+    aiosqlite and httpx threads, which a fork would copy in an unknown state.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def _ready() -> bool:
+    """No-op job; running it means the worker has imported this module."""
+    return True
+
+
+def make_thumbnail(raw: bytes) -> bytes:
+    """Build a thumbnail in a worker process and return its encoded bytes.
+
+    Args:
+        raw: Encoded source image bytes.
+
+    Returns:
+        Encoded thumbnail bytes (memoryviews do not pickle back to the parent).
+
+    Raises:
+        ValueError: If `raw` cannot be opened as an image.
+    """
+    return bytes(_GENERATOR.create_thumbnail_from_bytes(raw))
+
+
+class ThumbnailPool:
+    """Run `make_thumbnail` in worker processes, replacing the pool if it breaks.
+
+    A worker that dies (OOM kill, a decoder crash on a hostile image) leaves a
+    `ProcessPoolExecutor` permanently broken. The pool is then rebuilt and the
+    job retried once on the fresh one; the job is never run in-process, where
+    a crashing image would take the server down with it.
+
+    Args:
+        max_workers: Number of worker processes (defaults to the CPU count).
+    """
+
+    def __init__(self, max_workers: int = os.cpu_count() or 1) -> None:
+        self.max_workers = max_workers
+        self._executor = create_thumbnail_pool(max_workers)
+
+    async def run(self, raw: bytes) -> bytes:
+        """Return the encoded thumbnail for `raw`.
+
+        Raises:
+            ValueError: If `raw` cannot be opened as an image.
+            BrokenProcessPool: If the job also kills the rebuilt pool.
+        """
+        try:
+            return await self.submit(make_thumbnail, raw)
+        except BrokenProcessPool:
+            logging.warning("Thumbnail worker died; rebuilding the process pool")
+            return await self.submit(make_thumbnail, raw)
+
+    async def warm(self) -> None:
+        """Start every worker now instead of on the first uploads.
+
+        `ProcessPoolExecutor` spawns workers lazily on submit. Queuing one no-op
+        job per worker before awaiting any of them starts them all, so spawn
+        and import time (about a second) is paid at startup.
+        """
+        loop = asyncio.get_running_loop()
+        jobs = [loop.run_in_executor(self._executor, _ready) for _ in range(self.max_workers)]
+        await asyncio.gather(*jobs)
+
+    def shutdown(self) -> None:
+        """Stop the workers without waiting for queued jobs."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def submit(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run the top-level function `fn(*args)` in a worker and return its result.
+
+        Unlike `run`, the job is not retried; if the executor turns out to be
+        broken it is replaced and `BrokenProcessPool` propagates.
+        """
+        executor = self._executor
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            # Concurrent jobs see the same broken executor; only replace it once.
+            if self._executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = create_thumbnail_pool(self.max_workers)
+            raise
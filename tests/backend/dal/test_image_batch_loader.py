@@ -0,0 +1,91 @@
+"""Tests for `dal.image_batch_loader.ImageBatchLoader`."""
+
+import asyncio
+
+import pytest
+
+from dal.image_batch_loader import ImageBatchLoader
+from dal.image_dal import ImageDAL
+from models.image_record import ImageRecord
+from utils.database_init import AsyncDatabaseInitializer
+
+
+@pytest.fixture(autouse=True)
+def database_dir(tmp_path, monkeypatch):
+    """Point `AsyncDatabaseInitializer` at a fresh directory per test."""
+    monkeypatch.setenv("DATABASE_DIR", str(tmp_path))
+
+
+class _CountingImageDAL(ImageDAL):
+    """`ImageDAL` that records the ids of every batched lookup."""
+
+    def __init__(self, db: AsyncDatabaseInitializer) -> None:
+        super().__init__(db)
+        self.batches = []
+
+    async def get_images_by_ids(self, image_ids):
+        self.batches.append(list(image_ids))
+        return await super().get_images_by_ids(image_ids)
+
+
+async def _with_dal(scenario) -> None:
+    """Run `scenario(dal, ids)` against a database holding two images."""
+    db = AsyncDatabaseInitializer()
+    await db.ensure_database()
+    try:
+        dal = _CountingImageDAL(db)
+        ids = [await dal.create_image(ImageRecord(id=None, image_filename=name)) for name in "ab"]
+        await scenario(dal, ids)
+    finally:
+        await db.close()
+
+
+def test_concurrent_loads_share_one_query():
+    """Lookups issued together are answered by a single `IN` query."""
+
+    async def scenario(dal, ids) -> None:
+        loader = ImageBatchLoader(dal, max_delay_ms=50)
+        try:
+            records = await asyncio.gather(*(loader.load(i) for i in ids + ids))
+        finally:
+            await loader.close()
+
+        assert len(dal.batches) == 1
+        assert [rec.id for rec in records] == ids + ids
+        assert [rec.image_filename for rec in records[:2]] == ["a", "b"]
+
+    asyncio.run(_with_dal(scenario))
+
+
+def test_missing_id_resolves_to_none():
+    """An id with no row resolves to None without failing the rest of the batch."""
+
+    async def scenario(dal, ids) -> None:
+        loader = ImageBatchLoader(dal, max_delay_ms=50)
+        try:
+            found, missing = await asyncio.gather(loader.load(ids[0]), loader.load(999))
+        finally:
+            await loader.close()
+
+        assert found.id == ids[0]
+        assert missing is None
+
+    asyncio.run(_with_dal(scenario))
+
+
+def test_close_fails_waiting_lookups():
+    """Lookups still waiting for their batch fail with RuntimeError on close."""
+
+    async def scenario(dal, ids) -> None:
+        loader = ImageBatchLoader(dal, max_delay_ms=60_000)
+        waiting = [asyncio.create_task(loader.load(i)) for i in ids]
+        await asyncio.sleep(0.05)
+
+        await loader.close()
+
+        for task in waiting:
+            with pytest.raises(RuntimeError, match="closed"):
+                await asyncio.wait_for(task, timeout=1)
+        assert dal.batches == []
+
+    asyncio.run(_with_dal(scenario))
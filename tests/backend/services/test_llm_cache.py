@@ -0,0 +1,130 @@
+"""Tests for `LLMCache` and the operative-note caching rules built on it."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from models.image_record import ImageRecord
+from services.openai import llm_cache
+from services.openai.annotation_gen import OperativeNoteGenerator
+from services.openai.llm_cache import LLMCache
+
+IMAGES = [ImageRecord(id=1, image_filename="a.jpg", label="cecum")]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the cache's monotonic clock with a settable one."""
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entry_expires_after_ttl(clock):
+    """An entry is served until its TTL has passed, then dropped."""
+    cache = LLMCache(ttl_seconds=60)
+    cache.set("k", "note")
+
+    clock[0] += 60
+    assert cache.get("k") == "note"
+    clock[0] += 1
+    assert cache.get("k") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Past `max_entries`, the entry read or written longest ago goes first."""
+    cache = LLMCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+class _Stream:
+    """Async context manager yielding canned Responses stream events."""
+
+    def __init__(self, events):
+        self._events = events
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def __aiter__(self):
+        for event in self._events:
+            yield event
+
+
+def _delta(text: str) -> SimpleNamespace:
+    """Return a text-delta stream event carrying `text`."""
+    return SimpleNamespace(type="response.output_text.delta", delta=text)
+
+
+def _streaming_generator(events, calls) -> OperativeNoteGenerator:
+    """Return a generator whose client streams `events`, logging each request in `calls`."""
+
+    def stream(**kwargs):
+        calls.append(kwargs)
+        return _Stream(events)
+
+    client = SimpleNamespace(responses=SimpleNamespace(stream=stream))
+    return OperativeNoteGenerator(client, cache=LLMCache())
+
+
+async def _collect(generator: OperativeNoteGenerator) -> str:
+    """Stream a note for `IMAGES` and return the joined deltas."""
+    return "".join([delta async for delta in generator.stream_opnote(IMAGES, "base")])
+
+
+@pytest.mark.parametrize(
+    "events",
+    [
+        pytest.param([_delta("# Note"), SimpleNamespace(type="response.incomplete")], id="incomplete"),
+        pytest.param([SimpleNamespace(type="response.completed")], id="empty"),
+    ],
+)
+def test_stream_does_not_cache_incomplete_or_empty_notes(events):
+    """Only a stream ending in `response.completed` with text is cached."""
+    calls = []
+    generator = _streaming_generator(events, calls)
+
+    asyncio.run(_collect(generator))
+    asyncio.run(_collect(generator))
+
+    assert len(calls) == 2
+
+
+def test_stream_caches_completed_note():
+    """A completed, non-empty stream is served from the cache next time."""
+    calls = []
+    generator = _streaming_generator(
+        [_delta("# Note"), SimpleNamespace(type="response.completed")], calls
+    )
+
+    assert asyncio.run(_collect(generator)) == "# Note"
+    assert asyncio.run(_collect(generator)) == "# Note"
+    assert len(calls) == 1
+
+
+def test_empty_reply_is_not_cached():
+    """A reply with no output text raises every time instead of being cached."""
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(output=[], output_text="")
+
+    client = SimpleNamespace(responses=SimpleNamespace(create=create))
+    generator = OperativeNoteGenerator(client, cache=LLMCache())
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="no operative note text"):
+            asyncio.run(generator.generate_opnote(IMAGES, "base"))
+    assert len(calls) == 2
@@ -0,0 +1,75 @@
+"""Tests for `services.openai.single_flight.SingleFlight`."""
+
+import asyncio
+
+import pytest
+
+from services.openai.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    """Two callers with the same key await one execution and get its result."""
+
+    async def scenario() -> None:
+        flight = SingleFlight()
+        calls = 0
+
+        async def fetch() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "note"
+
+        results = await asyncio.gather(flight.run("k", fetch), flight.run("k", fetch))
+
+        assert results == ["note", "note"]
+        assert calls == 1
+        # The finished call is forgotten, so the next request runs afresh.
+        assert await flight.run("k", fetch) == "note"
+        assert calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_exception_reaches_every_caller():
+    """A failing shared call raises the same error in each waiting caller."""
+
+    async def scenario() -> None:
+        flight = SingleFlight()
+
+        async def fail() -> None:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            flight.run("k", fail), flight.run("k", fail), return_exceptions=True
+        )
+
+        assert [type(exc) for exc in results] == [RuntimeError, RuntimeError]
+        assert results[0] is results[1]
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    """Cancelling the first caller leaves the call running for the others."""
+
+    async def scenario() -> None:
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch() -> str:
+            await release.wait()
+            return "note"
+
+        first = asyncio.create_task(flight.run("k", fetch))
+        second = asyncio.create_task(flight.run("k", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        release.set()
+
+        assert await second == "note"
+
+    asyncio.run(scenario())
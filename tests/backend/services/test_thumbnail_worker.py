@@ -0,0 +1,62 @@
+"""Tests for `services.thumbnail_worker.ThumbnailPool`."""
+
+import asyncio
+import io
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from PIL import Image
+
+from services.thumbnail_worker import ThumbnailPool
+
+
+def _jpeg_bytes() -> bytes:
+    """Return a small encoded JPEG to thumbnail."""
+    buf = io.BytesIO()
+    Image.new("RGB", (400, 300), (10, 20, 30)).save(buf, "JPEG")
+    return buf.getvalue()
+
+
+def _die() -> None:
+    """Worker job that exits the process, breaking the executor."""
+    os._exit(1)
+
+
+def test_run_recovers_after_a_worker_dies():
+    """A dead worker breaks the executor; the next job rebuilds it and succeeds."""
+
+    async def scenario() -> None:
+        pool = ThumbnailPool(max_workers=1)
+        try:
+            raw = _jpeg_bytes()
+            expected = await pool.run(raw)
+            with pytest.raises(BrokenProcessPool):
+                await pool.submit(_die)
+
+            thumbnail = await pool.run(raw)
+
+            assert thumbnail == expected
+            assert Image.open(io.BytesIO(thumbnail)).format == "JPEG"
+        finally:
+            pool.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_run_rejects_bytes_that_are_not_an_image():
+    """Undecodable input raises ValueError and leaves the workers usable."""
+
+    async def scenario() -> None:
+        pool = ThumbnailPool(max_workers=1)
+        try:
+            with pytest.raises(ValueError):
+                await pool.run(b"definitely not an image")
+
+            thumbnail = await pool.run(_jpeg_bytes())
+
+            assert Image.open(io.BytesIO(thumbnail)).format == "JPEG"
+        finally:
+            pool.shutdown()
+
+    asyncio.run(scenario())
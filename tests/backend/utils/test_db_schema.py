@@ -0,0 +1,73 @@
+"""Tests for upgrading an existing database with `utils.db_schema.apply_schema`."""
+
+import asyncio
+import sqlite3
+
+from utils.database_init import AsyncDatabaseInitializer
+
+# IMAGE as created by the original release: thumbnails inline, no
+# thumbnail_path, no IMAGE_THUMBNAIL table and user_version left at 0.
+BASELINE_SCHEMA = """
+CREATE TABLE IMAGE (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    image_filename TEXT NOT NULL,
+    image_description TEXT,
+    image_thumbnail BLOB,
+    label TEXT,
+    reasoning TEXT,
+    user_documentation TEXT,
+    created_at INTEGER NOT NULL DEFAULT (strftime('%s','now'))
+);
+CREATE INDEX idx_image_created_at ON IMAGE(created_at);
+"""
+
+
+async def _boot() -> None:
+    """Run startup initialization once, as a fresh server process would."""
+    db = AsyncDatabaseInitializer()
+    try:
+        await db.ensure_database()
+    finally:
+        await db.close()
+
+
+def test_upgrade_moves_legacy_thumbnails_once(tmp_path, monkeypatch):
+    """Inline blobs move to IMAGE_THUMBNAIL; a second boot changes nothing."""
+    monkeypatch.setenv("DATABASE_DIR", str(tmp_path))
+    db_path = AsyncDatabaseInitializer().db_path
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(BASELINE_SCHEMA)
+        conn.executemany(
+            "INSERT INTO IMAGE (image_filename, image_thumbnail, label) VALUES (?, ?, ?)",
+            [("a.jpg", b"png-a", "cecum"), ("b.jpg", None, "ileum")],
+        )
+    conn.close()
+
+    asyncio.run(_boot())
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA user_version").fetchone() == (2,)
+        assert conn.execute("SELECT image_id, png FROM IMAGE_THUMBNAIL").fetchall() == [(1, b"png-a")]
+        rows = conn.execute(
+            "SELECT id, label, image_thumbnail, thumbnail_path, created_at FROM IMAGE ORDER BY id"
+        ).fetchall()
+        assert [row[:4] for row in rows] == [(1, "cecum", None, None), (2, "ileum", None, None)]
+        assert all(isinstance(row[4], int) and row[4] > 0 for row in rows)
+
+        # A legacy blob that appears after the upgrade would be moved by a
+        # re-run of the migration; the version check must skip it instead.
+        conn.execute("UPDATE IMAGE SET image_thumbnail = ? WHERE id = 2", (b"png-b",))
+        conn.commit()
+        before = list(conn.iterdump())
+    finally:
+        conn.close()
+
+    asyncio.run(_boot())
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert list(conn.iterdump()) == before
+    finally:
+        conn.close()
+
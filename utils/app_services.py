@@ -0,0 +1,47 @@
+"""Construct the shared, stateless services attached to `app.state`.
+
+DALs and service classes take all per-request data as method arguments, so a
+single instance of each is built at startup and reused by every request.
+"""
+
+from fastapi import FastAPI
+from openai import AsyncOpenAI
+
+from dal.image_batch_loader import ImageBatchLoader
+from dal.image_dal import ImageDAL
+from dal.thumbnail_dal import ThumbnailDAL
+from services.openai.annotation_gen import OperativeNoteGenerator
+from services.openai.cost_generator import CostGenerator
+from services.openai.image_classifier import ImageClassifier
+from services.openai.llm_cache import LLMCache
+from services.thumbnail_worker import ThumbnailPool
+from utils.database_init import AsyncDatabaseInitializer
+from utils.thumbnail_cache import ThumbnailCache
+from utils.thumbnail_store import ThumbnailStore
+
+
+def attach_services(
+    app: FastAPI, db_initializer: AsyncDatabaseInitializer, openai_client: AsyncOpenAI
+) -> None:
+    """Attach DAL and service singletons to `app.state`.
+
+    Args:
+        app: The FastAPI application whose state receives the services.
+        db_initializer: Initialized database helper shared by the DALs.
+        openai_client: Shared OpenAI async client used by the AI services.
+    """
+    state = app.state
+    # Holds legacy IMAGE_THUMBNAIL blobs only; file-backed thumbnails are
+    # served from disk. Can go once no rows without thumbnail_path remain.
+    state.thumbnail_cache = ThumbnailCache()
+    # Thumbnail files live next to the database file.
+    state.thumbnail_store = ThumbnailStore(db_initializer.db_dir / "thumbs")
+    state.image_dal = ImageDAL(db_initializer, state.thumbnail_cache, state.thumbnail_store)
+    # Shared across requests so concurrent id lookups coalesce into one query.
+    state.image_loader = ImageBatchLoader(state.image_dal)
+    state.thumbnail_dal = ThumbnailDAL(db_initializer)
+    # CPU-bound thumbnailing runs in worker processes; shut down in lifespan.
+    state.thumb_pool = ThumbnailPool()
+    state.cost_gen = CostGenerator()
+    state.classifier = ImageClassifier(openai_client)
+    state.opnote_generator = OperativeNoteGenerator(openai_client, cache=LLMCache())
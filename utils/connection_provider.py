@@ -0,0 +1,21 @@
+"""Structural type for objects that hand out database connections."""
+
+from typing import AsyncContextManager, Protocol
+
+import aiosqlite
+
+
+class ConnectionProvider(Protocol):
+    """Anything with async `connection()`/`transaction()` context managers, as used by the DALs.
+
+    `AsyncDatabaseInitializer` is the production implementation; the DALs and
+    cleaner depend only on this interface so another backend can be swapped in.
+    """
+
+    def connection(self) -> AsyncContextManager[aiosqlite.Connection]:
+        """Return a context manager yielding a connection for one unit of work."""
+        ...
+
+    def transaction(self) -> AsyncContextManager[aiosqlite.Connection]:
+        """Return a context manager yielding a connection inside one write transaction."""
+        ...
@@ -2,31 +2,73 @@
 
 import asyncio
 import time
+from typing import Optional
 
-from utils.database_init import AsyncDatabaseInitializer
+from dal.thumbnail_files import unlink_unreferenced
+from utils.connection_provider import ConnectionProvider
+from utils.thumbnail_cache import ThumbnailCache
+from utils.thumbnail_store import ThumbnailStore
+
+# Each chunk is its own short write transaction, so uploads queued on the
+# writer connection interleave with a large prune instead of waiting it out.
+_SQL_DELETE_CHUNK = (
+    "DELETE FROM IMAGE WHERE id IN "
+    "(SELECT id FROM IMAGE WHERE created_at < ? ORDER BY created_at LIMIT ?) RETURNING id, thumbnail_path"
+)
 
 
 class DatabaseCleaner:
     """Delete IMAGE rows older than the configured retention window."""
 
-    def __init__(self, db_initializer: AsyncDatabaseInitializer, retention_seconds: int = 86_400) -> None:
+    def __init__(
+        self,
+        db_initializer: ConnectionProvider,
+        retention_seconds: int = 86_400,
+        thumbnail_cache: Optional[ThumbnailCache] = None,
+        chunk_size: int = 500,
+        thumbnail_store: Optional[ThumbnailStore] = None,
+    ) -> None:
         """
         Args:
             db_initializer: Shared database initializer/connection provider.
             retention_seconds: Age threshold in seconds; rows older than this are removed.
+            thumbnail_cache: Optional cache to evict pruned images from.
+            chunk_size: Maximum rows deleted per write transaction.
+            thumbnail_store: Optional store whose files are removed with their rows.
         """
         self._db = db_initializer
         self.retention_seconds = retention_seconds
+        self._thumbnail_cache = thumbnail_cache
+        self.chunk_size = chunk_size
+        self._thumbnail_store = thumbnail_store
 
     async def prune_expired_images(self) -> int:
         """Delete IMAGE rows older than the retention window and return count removed."""
         cutoff = int(time.time()) - self.retention_seconds
-        async with self._db.connection() as conn:
-            await conn.execute("DELETE FROM IMAGE WHERE created_at < ?", (cutoff,))
-            await conn.commit()
-            cur = await conn.execute("SELECT changes()")
-            deleted = await cur.fetchone()
-            return int(deleted[0]) if deleted and deleted[0] is not None else 0
+        total = 0
+        while True:
+            async with self._db.transaction() as conn:
+                cur = await conn.execute(_SQL_DELETE_CHUNK, (cutoff, self.chunk_size))
+                deleted = await cur.fetchall()
+                if self._thumbnail_store is not None:
+                    # Files may be shared, so only those no row still uses go.
+                    await unlink_unreferenced(conn, self._thumbnail_store, (path for _, path in deleted))
+            if self._thumbnail_cache is not None:
+                for image_id, _ in deleted:
+                    self._thumbnail_cache.invalidate(image_id)
+            total += len(deleted)
+            if len(deleted) < self.chunk_size:
+                break
+            # Yield so other coroutines get the writer between chunks.
+            await asyncio.sleep(0)
+        if total:
+            # Release freed pages to the OS. A no-op unless the file was
+            # created with auto_vacuum=INCREMENTAL (see utils.database_init).
+            # executescript steps the pragma to completion; execute() would
+            # free a single page.
+            async with self._db.transaction() as conn:
+                await conn.executescript("PRAGMA incremental_vacuum;")
+        return total
 
     async def run_periodic_cleanup(self, interval_seconds: int = 3_600) -> None:
         """
@@ -1,4 +1,3 @@
-import asyncio
 import os
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -6,17 +5,74 @@ from typing import AsyncIterator, Optional
 
 import aiosqlite
 
+from utils.connection_pool import AsyncConnectionPool
+from utils.db_schema import apply_schema
+
+
+# Applied to the schema-setup connection before any DDL: the database is
+# switched to WAL (a persistent, file-level setting) before the first write,
+# so even the initial migration avoids rollback-journal fsyncs. Per-connection
+# settings (synchronous, busy_timeout, ...) come from the pool's
+# _CONNECTION_PRAGMAS, which the writer connection already has.
+# auto_vacuum only takes effect on a file with no tables yet (existing files
+# keep their mode); INCREMENTAL lets DatabaseCleaner return pruned pages to
+# the OS without a full VACUUM.
+_INIT_PRAGMAS = """
+PRAGMA auto_vacuum=INCREMENTAL;
+PRAGMA journal_mode=WAL;
+"""
+
+# Directories already validated/created in this process, so additional
+# initializers (e.g. one per app instance) skip the repeat stat/mkdir calls.
+_ensured_dirs: set[Path] = set()
+
+
+def _ensure_dir(db_dir: Path, env_dir: str) -> None:
+    """Validate and create `db_dir` once per process.
+
+    Raises:
+        RuntimeError: If the path is a file or cannot be created.
+    """
+    if db_dir in _ensured_dirs:
+        return
+
+    # mkdir alone is one syscall: exist_ok swallows an existing directory, and
+    # an existing file still raises FileExistsError, so no exists()/is_dir()
+    # stat is needed up front.
+    try:
+        db_dir.mkdir(parents=True, exist_ok=True)
+    except FileExistsError as exc:
+        # The path exists but is not a directory: a configuration error.
+        raise RuntimeError(
+            f"DATABASE_DIR={env_dir!r} points to a file, not a directory "
+            f"({db_dir}). Please set DATABASE_DIR to a directory path."
+        ) from exc
+    except Exception as exc:
+        raise RuntimeError(
+            f"Failed to create or access database directory at {db_dir}"
+        ) from exc
+    _ensured_dirs.add(db_dir)
+
 
 class AsyncDatabaseInitializer:
     """
     Manage an async SQLite database using the DATABASE_DIR environment variable.
 
-    The database file is located at: <DATABASE_DIR>/app.db. On first use the
-    directory is created (if missing) and the schema for the IMAGE table is
-    ensured without deleting any existing data.
+    The database file is located at: <DATABASE_DIR>/app.db. The directory is
+    created (if missing) on construction; `ensure_database()` must be awaited
+    once at application startup to apply the schema without deleting any
+    existing data (see `utils.db_schema`).
+    Read connections handed out by `connection()` come from a bounded
+    `AsyncConnectionPool`; `transaction()` uses a dedicated writer connection.
     """
 
-    def __init__(self, parent_folder: Optional[Path | str] = None) -> None:
+    def __init__(
+        self,
+        parent_folder: Optional[Path | str] = None,
+        *,
+        pool_size: int = 10,
+        max_overflow: int = 5,
+    ) -> None:
         # parent_folder is accepted for backward compatibility but ignored;
         # we always rely on DATABASE_DIR as requested.
         env_dir = os.getenv("DATABASE_DIR")
@@ -29,20 +85,7 @@ class AsyncDatabaseInitializer:
 
         db_dir = Path(env_dir).expanduser()
 
-        # If the path exists but is not a directory, that's a configuration error.
-        if db_dir.exists() and not db_dir.is_dir():
-            raise RuntimeError(
-                f"DATABASE_DIR={env_dir!r} points to a file, not a directory "
-                f"({db_dir}). Please set DATABASE_DIR to a directory path."
-            )
-
-        # Try to create the directory if it does not exist.
-        try:
-            db_dir.mkdir(parents=True, exist_ok=True)
-        except Exception as exc:
-            raise RuntimeError(
-                f"Failed to create or access database directory at {db_dir}"
-            ) from exc
+        _ensure_dir(db_dir, env_dir)
 
         # Attributes (keep names similar to older version for compatibility)
         # parent_folder is no longer used; but we still expose `parent`.
@@ -52,82 +95,70 @@ class AsyncDatabaseInitializer:
 
         # Internal flag to ensure schema setup runs only once per instance.
         self._initialized = False
+        # WAL lets many readers run next to one writer: reads share a
+        # query-only pool, while writes go through a single connection so
+        # in-process writers queue here instead of contending for SQLite's lock.
+        self._pool = AsyncConnectionPool(self.db_path, pool_size, max_overflow, query_only=True)
+        self._writer = AsyncConnectionPool(self.db_path, pool_size=1, max_overflow=0)
 
     async def ensure_database(self) -> None:
         """
         Ensure the SQLite database file and IMAGE schema exist at `self.db_path`.
 
-        On first call this will create the database file if missing, create the
-        IMAGE table, add any missing columns (`label`, `created_at`), and create
-        indexes. Subsequent calls on the same instance are no-ops.
+        On first call this will create the database file if missing and apply
+        `utils.db_schema.apply_schema` (tables, missing columns, indexes).
+        Subsequent calls on the same instance are no-ops.
         """
         if self._initialized:
             return
 
-        max_attempts = 3
-        for attempt in range(1, max_attempts + 1):
-            try:
-                async with aiosqlite.connect(self.db_path) as db:
-                    await db.execute(
-                        """
-                        CREATE TABLE IF NOT EXISTS IMAGE (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            image_filename TEXT NOT NULL,
-                            image_description TEXT,
-                            image_thumbnail BLOB,
-                            label TEXT,
-                            reasoning TEXT,
-                            user_documentation TEXT,
-                            created_at INTEGER NOT NULL DEFAULT (strftime('%s','now'))
-                        )
-                        """
-                    )
-
-                    # Ensure columns exist for older schemas.
-                    cur = await db.execute("PRAGMA table_info(IMAGE)")
-                    cols = await cur.fetchall()
-                    col_names = {col[1] for col in cols}
-                    if "label" not in col_names:
-                        await db.execute("ALTER TABLE IMAGE ADD COLUMN label TEXT")
-                    if "reasoning" not in col_names:
-                        await db.execute("ALTER TABLE IMAGE ADD COLUMN reasoning TEXT")
-                    if "user_documentation" not in col_names:
-                        await db.execute("ALTER TABLE IMAGE ADD COLUMN user_documentation TEXT")
-                    if "created_at" not in col_names:
-                        await db.execute(
-                            "ALTER TABLE IMAGE ADD COLUMN created_at INTEGER NOT NULL DEFAULT (strftime('%s','now'))"
-                        )
-                        await db.execute(
-                            "UPDATE IMAGE SET created_at = strftime('%s','now') WHERE created_at IS NULL"
-                        )
-
-                    await db.execute(
-                        "CREATE INDEX IF NOT EXISTS idx_image_created_at ON IMAGE(created_at)"
-                    )
-
-                    await db.commit()
-                break
-            except FileNotFoundError:
-                # On some platforms a transient missing file error may occur; retry a few times.
-                if attempt >= max_attempts:
-                    raise
-                await asyncio.sleep(0.1 * attempt)
-            except Exception:
-                # Re-raise unexpected exceptions for visibility.
-                raise
+        # Run the setup on the writer pool's connection, which then stays open
+        # as its only slot instead of being closed and reopened for the first
+        # write. Lock contention is waited out by busy_timeout (set on every
+        # pooled connection), so there is no Python-level retry loop; any
+        # other error is a real configuration problem and surfaces directly.
+        async with self._writer.acquire() as db:
+            await db.executescript(_INIT_PRAGMAS)
+            await apply_schema(db)
+            await db.commit()
 
         self._initialized = True
+        # Pre-open the readers so first requests find warm connections.
+        await self._pool.warm(self._pool.pool_size)
 
     @asynccontextmanager
     async def connection(self) -> AsyncIterator[aiosqlite.Connection]:
         """
-        Async context manager yielding an `aiosqlite.Connection`.
+        Async context manager yielding a pooled, read-only `aiosqlite.Connection`.
 
-        The database is created/verified on the first use via `ensure_database()`.
+        Assumes `ensure_database()` already ran at startup, so entering is just
+        a pool checkout (no per-query init check or extra coroutine). The
+        connection is returned to the pool (not closed) when the block exits.
+        Use `transaction()` for writes.
         """
-        await self.ensure_database()
-        conn = await aiosqlite.connect(self.db_path)
-        try:
+        async with self._pool.acquire() as conn:
             yield conn
-        finally:
-            await conn.close()
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Async context manager running the block in one write transaction.
+
+        `BEGIN IMMEDIATE` takes the write lock up front, so a concurrent writer
+        waits on `busy_timeout` instead of failing when a deferred read lock is
+        upgraded. The transaction commits when the block exits normally and is
+        rolled back if it raises. Runs on the single writer connection.
+        """
+        async with self._writer.acquire() as conn:
+            await conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                await conn.rollback()
+                raise
+            await conn.commit()
+
+    async def close(self) -> None:
+        """Close all pooled connections; call once on application shutdown."""
+        await self._pool.close()
+        await self._writer.close()
@@ -0,0 +1,85 @@
+"""SQLite schema for the IMAGE tables and in-place upgrades of older files."""
+
+import aiosqlite
+
+# Integer Unix seconds. strftime() rather than unixepoch(), which needs SQLite
+# 3.38+; the CAST stores an INTEGER directly instead of relying on affinity.
+_NOW = "CAST(strftime('%s','now') AS INTEGER)"
+
+# Stored in the file header via PRAGMA user_version once every step below has
+# run. Bump it whenever SCHEMA_SCRIPT or the upgrade steps change.
+SCHEMA_VERSION = 2
+
+# Thumbnails are files named by IMAGE.thumbnail_path (see utils.thumbnail_store).
+# IMAGE_THUMBNAIL holds blobs written before that; they are still served and
+# go away with their image via ON DELETE CASCADE.
+SCHEMA_SCRIPT = f"""
+CREATE TABLE IF NOT EXISTS IMAGE (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    image_filename TEXT NOT NULL,
+    image_description TEXT,
+    label TEXT,
+    reasoning TEXT,
+    user_documentation TEXT,
+    created_at INTEGER NOT NULL DEFAULT ({_NOW}),
+    thumbnail_path TEXT
+);
+CREATE TABLE IF NOT EXISTS IMAGE_THUMBNAIL (
+    image_id INTEGER PRIMARY KEY REFERENCES IMAGE(id) ON DELETE CASCADE,
+    png BLOB NOT NULL
+);
+"""
+
+
+async def apply_schema(db: aiosqlite.Connection) -> None:
+    """Create missing tables, columns and indexes on `db` without touching data.
+
+    Databases created before thumbnails moved to `IMAGE_THUMBNAIL` keep their
+    legacy `IMAGE.image_thumbnail` column; its blobs are copied across and
+    cleared so they no longer bloat IMAGE pages.
+
+    A file already at `SCHEMA_VERSION` is left alone after a single header
+    read, skipping the `PRAGMA table_info` scan and DDL on every later boot.
+
+    Args:
+        db: Open connection; the caller commits.
+    """
+    async with db.execute("PRAGMA user_version") as cur:
+        (version,) = await cur.fetchone()
+    if version >= SCHEMA_VERSION:
+        return
+
+    # One executescript call instead of a queue round trip per statement. It
+    # opens the transaction the caller's commit() closes, so the DDL and every
+    # upgrade step below land atomically instead of autocommitting one by one.
+    await db.executescript("BEGIN IMMEDIATE;" + SCHEMA_SCRIPT)
+
+    # Ensure columns exist for older schemas.
+    cur = await db.execute("PRAGMA table_info(IMAGE)")
+    cols = await cur.fetchall()
+    col_names = {col[1] for col in cols}
+    if "label" not in col_names:
+        await db.execute("ALTER TABLE IMAGE ADD COLUMN label TEXT")
+    if "reasoning" not in col_names:
+        await db.execute("ALTER TABLE IMAGE ADD COLUMN reasoning TEXT")
+    if "user_documentation" not in col_names:
+        await db.execute("ALTER TABLE IMAGE ADD COLUMN user_documentation TEXT")
+    if "created_at" not in col_names:
+        # ALTER TABLE only accepts constant defaults, so add the column with 0
+        # and stamp the existing rows in a second statement.
+        await db.execute("ALTER TABLE IMAGE ADD COLUMN created_at INTEGER NOT NULL DEFAULT 0")
+        await db.execute(f"UPDATE IMAGE SET created_at = {_NOW}")
+    if "thumbnail_path" not in col_names:
+        await db.execute("ALTER TABLE IMAGE ADD COLUMN thumbnail_path TEXT")
+    if "image_thumbnail" in col_names:
+        await db.execute(
+            "INSERT OR IGNORE INTO IMAGE_THUMBNAIL (image_id, png) "
+            "SELECT id, image_thumbnail FROM IMAGE WHERE image_thumbnail IS NOT NULL"
+        )
+        await db.execute("UPDATE IMAGE SET image_thumbnail = NULL WHERE image_thumbnail IS NOT NULL")
+
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_image_created_at ON IMAGE(created_at)")
+    # Thumbnail files are shared by content; deletes check remaining references.
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_image_thumbnail_path ON IMAGE(thumbnail_path)")
+    # PRAGMA arguments cannot be bound; SCHEMA_VERSION is a trusted int.
+    await db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
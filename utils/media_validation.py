@@ -1,33 +1,78 @@
 """Validation helpers for uploaded multimedia content."""
 
-import base64
+import io
+
+import pybase64
 from fastapi import HTTPException, UploadFile
+from PIL import Image
+
+ALLOWED_AUDIO_TYPES = frozenset({"audio/wav", "audio/x-wav"})
+ALLOWED_AUDIO_EXTENSIONS = frozenset({"wav"})
+# OpenAI's transcription endpoint rejects files over 25 MB.
+MAX_AUDIO_BYTES = 25 * 1024 * 1024
+
+UNSUPPORTED_IMAGE_DETAIL = "Not a supported image."
+
+_BASE64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+_PROBE_BYTES = 64
+
+
+def _is_base64_text(raw: bytes) -> bool:
+    """Return True when the upload body looks like base64 text rather than binary.
+
+    Only a short prefix is probed: binary image formats start with non-base64
+    magic bytes (JPEG 0xFF, PNG 0x89), so the full body is never scanned here.
+    Full validation happens when the payload is decoded.
+    """
+    head = raw[:_PROBE_BYTES]
+    return bool(head) and not head.translate(None, _BASE64_ALPHABET)
+
 
-ALLOWED_AUDIO_TYPES = {"audio/wav", "audio/x-wav"}
+def decode_image_upload(raw: bytes) -> bytes:
+    """Return binary image bytes, decoding the upload if it was sent as base64 text.
 
+    The result is checked with Pillow before any paid or CPU-heavy work starts,
+    so a non-image body is rejected up front.
 
-def ensure_base64_image(raw: bytes) -> bytes:
-    """Return base64-encoded image bytes, encoding binary input when necessary."""
+    Raises:
+        HTTPException(400) if a text upload is not valid base64 or the bytes
+        are not an image Pillow can read.
+    """
+    if _is_base64_text(raw):
+        try:
+            raw = pybase64.b64decode(raw, validate=True)
+        except Exception as exc:
+            raise HTTPException(status_code=400, detail="Invalid base64 image data.") from exc
     try:
-        raw.decode("utf-8")
-        return raw
-    except Exception:
-        return base64.b64encode(raw)
+        # verify() checks the file structure without decoding the pixels.
+        with Image.open(io.BytesIO(raw)) as image:
+            image.verify()
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=UNSUPPORTED_IMAGE_DETAIL) from exc
+    return raw
 
 
 def validate_audio_file(audio_file: UploadFile) -> None:
     """Validate that the uploaded audio file is WAV format."""
-    if not (audio_file.filename and audio_file.filename.lower().endswith(".wav")):
+    # Lower-case only the extension, not the whole filename.
+    _, dot, extension = (audio_file.filename or "").rpartition(".")
+    if not dot or extension.lower() not in ALLOWED_AUDIO_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Audio must be a .wav file.")
-    if audio_file.content_type not in ALLOWED_AUDIO_TYPES:
+    # Ignore MIME parameters such as "; codecs=1" and header casing.
+    content_type = (audio_file.content_type or "").partition(";")[0].strip().lower()
+    if content_type not in ALLOWED_AUDIO_TYPES:
         raise HTTPException(
             status_code=415, detail="Unsupported audio content type; expected audio/wav."
         )
 
 
 async def read_audio_bytes(audio_file: UploadFile) -> bytes:
-    """Read validated audio bytes, ensuring the upload is not empty."""
+    """Read validated audio bytes, ensuring the upload is not empty or oversized."""
     validate_audio_file(audio_file)
+    # Multipart parsing has already spooled the upload; checking its size first
+    # avoids pulling an oversized file into memory just to have OpenAI reject it.
+    if audio_file.size is not None and audio_file.size > MAX_AUDIO_BYTES:
+        raise HTTPException(status_code=413, detail="Uploaded audio file is too large.")
     audio_bytes = await audio_file.read()
     if not audio_bytes:
         raise HTTPException(status_code=400, detail="Uploaded audio file is empty.")
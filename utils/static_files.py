@@ -0,0 +1,38 @@
+"""StaticFiles mount that adds a Cache-Control policy to every response."""
+
+import os
+
+from starlette.responses import Response
+from starlette.staticfiles import PathLike, StaticFiles
+from starlette.types import Scope
+
+# Frontend assets are not content-hashed, so browsers must revalidate; the
+# ETag/Last-Modified that StaticFiles already emits turns repeat hits into 304s.
+DEFAULT_CACHE_CONTROL = "no-cache"
+
+
+class CachedStaticFiles(StaticFiles):
+    """`StaticFiles` that sets `Cache-Control` on file and 304 responses.
+
+    Args:
+        cache_control: Header value applied to every served asset. Use a
+            long-lived `public, max-age=31536000, immutable` only for
+            content-hashed filenames.
+        **kwargs: Forwarded to `StaticFiles`.
+    """
+
+    def __init__(self, *, cache_control: str = DEFAULT_CACHE_CONTROL, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.cache_control = cache_control
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        """Build the file (or 304) response and attach the cache policy."""
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["Cache-Control"] = self.cache_control
+        return response
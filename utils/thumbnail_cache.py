@@ -0,0 +1,52 @@
+"""Bounded in-process LRU cache for legacy (blob) thumbnail responses.
+
+Thumbnails never change after insert, so the `(etag, body)` pair served for an
+image id can be reused until the image is updated or deleted.
+"""
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+CachedThumbnail = Tuple[str, bytes]
+
+
+class ThumbnailCache:
+    """LRU map of image id -> `(etag, png_bytes)` bounded by entries and bytes.
+
+    All methods are synchronous and never await, so they are atomic with
+    respect to other coroutines on the event loop and need no lock.
+
+    Args:
+        max_entries: Maximum number of thumbnails kept.
+        max_bytes: Maximum total size of cached thumbnail bodies.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 32 * 1024 * 1024) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[int, CachedThumbnail]" = OrderedDict()
+        self._size = 0
+
+    def get(self, image_id: int) -> Optional[CachedThumbnail]:
+        """Return the cached `(etag, body)` for `image_id` and mark it recently used."""
+        entry = self._entries.get(image_id)
+        if entry is not None:
+            self._entries.move_to_end(image_id)
+        return entry
+
+    def put(self, image_id: int, etag: str, body: bytes) -> None:
+        """Cache `body` for `image_id`, evicting least recently used entries to fit."""
+        if len(body) > self.max_bytes:
+            return
+        self.invalidate(image_id)
+        self._entries[image_id] = (etag, body)
+        self._size += len(body)
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def invalidate(self, image_id: int) -> None:
+        """Drop any cached thumbnail for `image_id`."""
+        entry = self._entries.pop(image_id, None)
+        if entry is not None:
+            self._size -= len(entry[1])
@@ -0,0 +1,75 @@
+"""Filesystem storage for thumbnail images.
+
+Thumbnails are written as files next to the database instead of as BLOBs,
+so IMAGE rows stay small (cheap scans, small WAL, metadata-only deletes) and
+thumbnails are served straight from the OS page cache. Rows keep only the
+file name, relative to the store root.
+
+Files are content-addressed (SHA-256 of the encoded bytes), so identical
+thumbnails share one file and re-uploads skip the write. Because several rows
+may name the same file, callers only delete files no row references any more
+(see `dal.thumbnail_files`).
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+# File suffix -> HTTP media type for the formats ThumbnailGenerator writes.
+MEDIA_TYPES = {".png": "image/png", ".jpg": "image/jpeg"}
+_PNG_MAGIC = b"\x89PNG"
+
+
+class ThumbnailStore:
+    """Write, locate and delete thumbnail files under one directory.
+
+    Methods do blocking file I/O; async callers run them via `asyncio.to_thread`.
+
+    Args:
+        root: Directory holding the thumbnail files (created if missing).
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def name_for(data: Buffer) -> str:
+        """Return the content-addressed file name for `data`.
+
+        The suffix (`.png` or `.jpg`) follows the encoded format.
+        """
+        suffix = ".png" if data[:4] == _PNG_MAGIC else ".jpg"
+        return hashlib.sha256(data).hexdigest() + suffix
+
+    def write(self, name: str, data: Buffer) -> None:
+        """Atomically write `data` as `name` unless that file already exists.
+
+        The bytes go to a temporary file in the same directory that is then
+        renamed into place, so readers never observe a partially written file.
+        """
+        path = self.root / name
+        if path.exists():
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def path_for(self, name: str) -> Path:
+        """Return the absolute path of the stored file `name`."""
+        return self.root / name
+
+    def delete(self, names: Iterable[Optional[str]]) -> None:
+        """Remove the named files, ignoring None entries and files already gone."""
+        for name in names:
+            if name:
+                (self.root / name).unlink(missing_ok=True)